@@ -0,0 +1,128 @@
+"""shop modellaridagi indekslar samarasini o'lchaydi.
+
+Alohida test bazasini yaratadi, uni sintetik ma'lumot bilan to'ldiradi
+(standart: 1 000 000 mahsulot), so'ng har bir "issiq" so'rov uchun EXPLAIN
+va vaqtni ``Meta.indexes`` olib tashlangan (oldin) va qaytarilgan (keyin)
+holatlarda yozib oladi::
+
+    python -m benchmarks.explain_indexes --products 1000000 --output explain.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.apps import apps  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from benchmarks.seed import existing_ids, seed  # noqa: E402
+from shop.models import Product, CartItem, Order, Comment  # noqa: E402
+
+
+def hot_queries(ids):
+    user_id = ids['user_ids'][len(ids['user_ids']) // 2]
+    category_id = ids['category_ids'][0]
+    product_id = ids['product_ids'][len(ids['product_ids']) // 2]
+    price_range = {'price__gte': Decimal(100000), 'price__lte': Decimal(120000)}
+    return {
+        'product_list': Product.objects.order_by('-created_at', '-id')[:20],
+        'product_category_price': Product.objects.filter(category_id=category_id, **price_range)
+                                                 .order_by('price')[:20],
+        'product_price_range': Product.objects.filter(**price_range).order_by('price')[:20],
+        'cart_for_user': CartItem.objects.filter(user_id=user_id)
+                                         .order_by('product_id').values_list('product_id', 'quantity'),
+        'orders_for_user': Order.objects.filter(user_id=user_id).order_by('-created_at', '-id')[:20],
+        'unpaid_orders_for_user': Order.objects.filter(user_id=user_id, is_paid=False).order_by('-created_at')[:20],
+        'comments_for_product': Comment.objects.filter(product_id=product_id)
+                                               .order_by('-created_at', '-id')[:20],
+    }
+
+
+def measure(queries, repeat):
+    report = {}
+    for name, queryset in queries.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+        report[name] = {
+            'explain': queryset.explain(),
+            'median_ms': round(statistics.median(timings), 3),
+        }
+    return report
+
+
+def analyze():
+    if connection.vendor in ('sqlite', 'postgresql'):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+
+def shop_indexes():
+    for model in apps.get_app_config('shop').get_models():
+        for index in model._meta.indexes:
+            yield model, index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=1_000_000)
+    parser.add_argument('--orders', type=int, default=200_000)
+    parser.add_argument('--comments', type=int, default=500_000)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="Natijani JSON faylga yozish")
+    parser.add_argument('--keepdb', action='store_true', help="Test bazasini o'chirmaslik")
+    args = parser.parse_args()
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        if not Product.objects.exists():
+            ids = seed(products=args.products, orders=args.orders, comments=args.comments,
+                       users=args.users, cart_items=args.users * 3)
+        else:
+            ids = existing_ids()
+
+        queries = hot_queries(ids)
+        indexes = list(shop_indexes())
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.remove_index(model, index)
+        analyze()
+        before = measure(queries, args.repeat)
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+        analyze()
+        after = measure(queries, args.repeat)
+    finally:
+        if not args.keepdb:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report = {
+        name: {'before': before[name], 'after': after[name]}
+        for name in queries
+    }
+    for name, result in report.items():
+        print(f"\n== {name}: {result['before']['median_ms']} ms -> {result['after']['median_ms']} ms")
+        print('-- oldin:\n' + result['before']['explain'])
+        print('-- keyin:\n' + result['after']['explain'])
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Sinxron (WSGI) va async (ASGI) o'qish endpoint'larini parallel yuk ostida solishtiradi.
+
+Ikkala serverni o'zi ishga tushiradi (gunicorn sync worker'lar va uvicorn),
+har biriga bir xil sonli parallel so'rov yuboradi va kechikish
+persentillari hamda o'tkazuvchanlikni chiqaradi::
+
+    python -m benchmarks.load_asgi_wsgi --concurrency 64 --requests 2000 --token <token>
+
+Serverlar allaqachon ishlayotgan bo'lsa: ``--wsgi-url`` va ``--asgi-url``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (nomi, sinxron yo'l, async yo'l)
+ENDPOINTS = [
+    ('categories', '/api/categories/', '/api/async/categories/'),
+    ('products', '/api/products/', '/api/async/products/'),
+    ('wishlist', '/api/wishlist/', '/api/async/wishlist/'),
+    ('orders', '/api/orders/', '/api/async/orders/'),
+]
+
+
+def start_server(command, url):
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url + '/api/categories/', timeout=1)
+            return process
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Server ishga tushmadi: {' '.join(command)}")
+
+
+def fetch(url, headers):
+    started = time.perf_counter()
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            ok = response.status == 200
+    except urllib.error.URLError:
+        ok = False
+    return (time.perf_counter() - started) * 1000, ok
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def run_load(url, total, concurrency, headers):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: fetch(url, headers), range(total)))
+    elapsed = time.perf_counter() - started
+    timings = [ms for ms, ok in results if ok]
+    if not timings:
+        return {'errors': total}
+    return {
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'p99_ms': round(percentile(timings, 0.99), 2),
+        'rps': round(len(timings) / elapsed, 1),
+        'errors': total - len(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--token', help="wishlist/orders uchun DRF token")
+    parser.add_argument('--wsgi-url', help="Ishlayotgan WSGI server (masalan http://127.0.0.1:8001)")
+    parser.add_argument('--asgi-url', help="Ishlayotgan ASGI server (masalan http://127.0.0.1:8002)")
+    parser.add_argument('--output', help="Natijani JSON faylga yozish")
+    args = parser.parse_args()
+
+    env_python = sys.executable
+    processes = []
+    wsgi_url, asgi_url = args.wsgi_url, args.asgi_url
+    try:
+        if not wsgi_url:
+            wsgi_url = 'http://127.0.0.1:8001'
+            processes.append(start_server(
+                [env_python, '-m', 'gunicorn', 'core.wsgi:application', '-b', '127.0.0.1:8001',
+                 '-w', str(args.workers)], wsgi_url))
+        if not asgi_url:
+            asgi_url = 'http://127.0.0.1:8002'
+            processes.append(start_server(
+                [env_python, '-m', 'uvicorn', 'core.asgi:application', '--port', '8002',
+                 '--workers', str(args.workers), '--no-access-log'], asgi_url))
+
+        headers = {'Authorization': f'Token {args.token}'} if args.token else {}
+        report = {}
+        for name, sync_path, async_path in ENDPOINTS:
+            if name in ('wishlist', 'orders') and not args.token:
+                continue
+            report[name] = {
+                'wsgi': run_load(wsgi_url + sync_path, args.requests, args.concurrency, headers),
+                'asgi': run_load(asgi_url + async_path, args.requests, args.concurrency, headers),
+            }
+            for server, result in report[name].items():
+                print(f'{name:<12} {server}: {result}')
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    main()
@@ -0,0 +1,89 @@
+"""1 000 ta mahsulotli javobni render qilish vaqtini solishtiradi.
+
+Payload ``ProductSerializer`` chiqishi shaklida (ichki kategoriya, rasmlar,
+srcset, ``Decimal`` narxlar) bazasiz yaratiladi::
+
+    python -m benchmarks.render_json --products 1000 --repeat 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from shop.renderers import ORJSONRenderer, orjson  # noqa: E402
+
+
+def srcset(stem):
+    return OrderedDict(
+        (label, OrderedDict(width=width, webp=f'https://cdn.example.com/{stem}_{label}.webp',
+                            jpeg=f'https://cdn.example.com/{stem}_{label}.jpeg'))
+        for label, width in (('thumb', 160), ('small', 320), ('medium', 640), ('large', 1280))
+    )
+
+
+def product(i):
+    return OrderedDict(
+        id=i,
+        name=f'Mahsulot {i} — qishki to‘plam',
+        slug=f'mahsulot-{i}',
+        description='Yumshoq, issiq va chidamli mato. ' * 8,
+        price=Decimal(f'{100000 + i * 37}.50'),
+        main_image=f'https://cdn.example.com/products/main/{i}.jpg',
+        main_image_srcset=srcset(f'products/main/variants/{i}'),
+        thumbnail=f'https://cdn.example.com/products/main/variants/{i}_thumb.jpeg',
+        category=OrderedDict(id=i % 50, name=f'Kategoriya {i % 50}', slug=f'kategoriya-{i % 50}'),
+        images=[
+            OrderedDict(id=i * 10 + n, product=i, image=f'https://cdn.example.com/products/extra/{i}_{n}.jpg',
+                        srcset=srcset(f'products/extra/variants/{i}_{n}'))
+            for n in range(3)
+        ],
+        likes_count=i % 997,
+        comments_count=i % 101,
+        average_rating=round((i % 50) / 10, 2),
+    )
+
+
+def measure(renderer, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = renderer.render(data)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    data = OrderedDict(next=None, previous=None, results=[product(i) for i in range(args.products)])
+    renderers = [('JSONRenderer (stdlib json)', JSONRenderer())]
+    if orjson is not None:
+        renderers.append(('ORJSONRenderer (orjson)', ORJSONRenderer()))
+    else:
+        print("orjson o'rnatilmagan — faqat stdlib o'lchanadi")
+
+    baseline = None
+    for name, renderer in renderers:
+        median_ms, size = measure(renderer, data, args.repeat)
+        baseline = baseline or median_ms
+        print(f'{name:<30} {median_ms:8.2f} ms  {size / 1024:8.1f} KiB  x{baseline / median_ms:.1f}')
+
+
+if __name__ == '__main__':
+    main()
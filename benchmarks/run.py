@@ -0,0 +1,135 @@
+"""shop API uchun takrorlanuvchi benchmark.
+
+Alohida test bazasini yaratadi, uni ``seed()`` bilan to'ldiradi va
+``benchmarks/scenarios.py`` ssenariylarini haqiqiy URLconf orqali (test
+client) yoki ``--url`` bilan ishlayotgan serverga qarshi bajaradi::
+
+    python -m benchmarks.run --write-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json   # regressiyada chiqish kodi 1
+
+``--url`` rejimida server o'z bazasi bilan ishlaydi (ma'lumotni oldindan
+``--seed-only --keepdb`` yoki boshqa yo'l bilan tayyorlang); so'rovlar soni
+faqat server ``Server-Timing`` sarlavhasini qaytarsa yoziladi.
+
+Regressiya tekshiruvi so'rovlar soni bo'yicha — u mashinaga bog'liq emas.
+``--check-latency`` p95 vaqtlarini ham tekshiradi: baseline qiymati
+kalibrlash natijalari (``calibration_ms``) nisbatiga ko'paytiriladi.
+``--url`` rejimida server boshqa mashinada bo'lishi mumkin, shuning uchun
+u yerda vaqt tekshirilmaydi.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.db import connection  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+
+from benchmarks.scenarios import (  # noqa: E402
+    SCENARIOS, ClientSession, HTTPSession, ScenarioData, calibrate, compare, run_scenarios, summarize,
+)
+from benchmarks.seed import rebuild_derived, seed  # noqa: E402
+from shop.models import Product  # noqa: E402
+
+# --scale 1 dagi hajmlar
+VOLUMES = {
+    'products': 2000, 'categories': 20, 'users': 200, 'orders': 1000, 'comments': 2000,
+    'cart_items': 500, 'images': 4000, 'likes': 5000, 'ratings': 5000, 'wishlist_items': 1000,
+}
+
+
+def bench_token():
+    user, _ = User.objects.get_or_create(username='bench-runner')
+    token, _ = Token.objects.get_or_create(user=user)
+    return token.key
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1.0, help="Ma'lumot hajmi ko'paytmasi")
+    for name, default in VOLUMES.items():
+        parser.add_argument(f'--{name.replace("_", "-")}', type=int, help=f'standart: {default} x scale')
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS), dest='scenarios')
+    parser.add_argument('--cold', action='store_true', help="Har iteratsiyadan oldin keshlarni tozalash")
+    parser.add_argument('--url', help="Ishlayotgan server (test client o'rniga)")
+    parser.add_argument('--token', help="--url rejimida foydalanuvchi tokeni")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keepdb', action='store_true')
+    parser.add_argument('--seed-only', action='store_true', help="Faqat bazani to'ldirish")
+    parser.add_argument('--output', help="Natijani JSON faylga yozish")
+    parser.add_argument('--baseline', help="Shu baseline bilan solishtirish")
+    parser.add_argument('--write-baseline', help="Natijani baseline sifatida yozish")
+    parser.add_argument('--check-latency', action='store_true',
+                        help="--baseline bilan p95'ni ham (kalibrlashga nisbatan) tekshirish")
+    args = parser.parse_args()
+
+    volumes = {
+        name: getattr(args, name) if getattr(args, name) is not None else int(default * args.scale)
+        for name, default in VOLUMES.items()
+    }
+
+    old_name = connection.settings_dict['NAME']
+    if not args.url:
+        connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        if not args.url and not Product.objects.exists():
+            seed(seed_value=args.seed, log=lambda message: print(message, file=sys.stderr), **volumes)
+            rebuild_derived(log=lambda message: print(message, file=sys.stderr))
+        if args.seed_only:
+            return
+
+        session = HTTPSession(args.token, args.url) if args.url else ClientSession(bench_token())
+        data = ScenarioData(args.seed)
+        clear = (lambda: [cache.clear() for cache in caches.all()]) if args.cold else None
+        summary = summarize(run_scenarios(session, data, args.iterations, args.scenarios, before_iteration=clear))
+        calibration_ms = None if args.url else calibrate()
+    finally:
+        if not args.url and not args.keepdb:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    for name, result in summary.items():
+        print(f"{name:<10} p50 {result['p50_ms']:>8} ms  p95 {result['p95_ms']:>8} ms  "
+              f"p99 {result['p99_ms']:>8} ms  so'rovlar {result['queries']}")
+        for step, stats in result['steps'].items():
+            print(f"  {step:<16} p50 {stats['p50_ms']:>8} ms  p95 {stats['p95_ms']:>8} ms  so'rovlar {stats['queries']}")
+
+    if calibration_ms is not None:
+        print(f"kalibrlash {calibration_ms} ms")
+
+    report = {'volumes': volumes, 'iterations': args.iterations, 'calibration_ms': calibration_ms, 'scenarios': summary}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.write_baseline:
+        baseline = {
+            'thresholds': {'p95_tolerance': 0.5, 'queries_tolerance': 0},
+            'volumes': volumes,
+            'calibration_ms': calibration_ms,
+            'scenarios': {
+                name: {'p95_ms': result['p95_ms'], 'queries': result['queries']}
+                for name, result in summary.items()
+            },
+        }
+        Path(args.write_baseline).write_text(json.dumps(baseline, indent=2) + '\n')
+    if args.baseline:
+        failures = compare(
+            summary, json.loads(Path(args.baseline).read_text()), calibration_ms if args.check_latency else None
+        )
+        for failure in failures:
+            print(f'REGRESSIYA: {failure}', file=sys.stderr)
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""API ssenariylari: ko'rish, qidiruv, savatcha, buyurtma, istaklar ro'yxati.
+
+Har bir ssenariy ``session`` ustida bir nechta so'rov bajaradi va har bir
+qadam uchun ``(holat kodi, ms, SQL so'rovlar soni)`` yozib oladi.
+``ClientSession`` haqiqiy URLconf'ni test client orqali chaqiradi (so'rovlar
+soni aniq), ``HTTPSession`` esa ishlayotgan serverga HTTP orqali ulanadi
+(so'rovlar soni ``Server-Timing`` sarlavhasidan, agar yoqilgan bo'lsa).
+"""
+import json
+import math
+import random
+import re
+import sqlite3
+import statistics
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from benchmarks.seed import ADJECTIVES, NOUNS
+from shop.models import Category, Product
+
+_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+class ClientSession:
+    def __init__(self, token):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+
+    def request(self, method, path, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = getattr(self.client, method)(path, data, format='json')
+            elapsed = (time.perf_counter() - started) * 1000
+        body = response.json() if response.content and response['Content-Type'] == 'application/json' else None
+        return response.status_code, body, elapsed, len(queries)
+
+
+class HTTPSession:
+    def __init__(self, token, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.headers = {'Authorization': f'Token {token}', 'Content-Type': 'application/json'}
+
+    def request(self, method, path, data=None):
+        # Kursor havolalari to'liq URL bo'lib keladi
+        if path.startswith('http'):
+            path = urlsplit(path)._replace(scheme='', netloc='').geturl()
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=body, headers=self.headers,
+                                         method=method.upper())
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                status, content, headers = response.status, response.read(), response.headers
+        except urllib.error.HTTPError as exc:
+            status, content, headers = exc.code, exc.read(), exc.headers
+        elapsed = (time.perf_counter() - started) * 1000
+        match = _QUERIES.search(headers.get('Server-Timing', ''))
+        return status, json.loads(content) if content else None, elapsed, int(match.group(1)) if match else None
+
+
+class ScenarioData:
+    """Ssenariylar uchun tasodifiy (lekin takrorlanuvchi) id va so'zlar."""
+
+    def __init__(self, seed_value=0):
+        self.rng = random.Random(seed_value)
+        self.product_ids = list(Product.objects.values_list('pk', flat=True))
+        self.in_stock_ids = list(Product.objects.filter(stock__gt=100).values_list('pk', flat=True))
+        self.category_ids = list(Category.objects.values_list('pk', flat=True))
+
+    def product_id(self, in_stock=False):
+        return self.rng.choice(self.in_stock_ids if in_stock else self.product_ids)
+
+    def category_id(self):
+        return self.rng.choice(self.category_ids)
+
+    def search_word(self):
+        return self.rng.choice(ADJECTIVES + NOUNS)
+
+
+class Recorder:
+    """Bitta ssenariy iteratsiyasi qadamlari."""
+
+    def __init__(self, session):
+        self.session = session
+        self.steps = []
+
+    def __call__(self, step, method, path, data=None, expect=(200,)):
+        status, body, elapsed, queries = self.session.request(method, path, data)
+        if status not in expect:
+            raise AssertionError(f'{step}: {method.upper()} {path} -> {status} {body}')
+        self.steps.append({'step': step, 'ms': elapsed, 'queries': queries})
+        return body
+
+
+def browse(call, data):
+    call('categories', 'get', reverse('category-list'))
+    page = call('products', 'get', reverse('product-list'))
+    if page['next']:
+        call('products_next', 'get', page['next'])
+    call('products_popular', 'get', reverse('product-list') + '?ordering=popular')
+    call('product_detail', 'get', reverse('product-detail', args=[data.product_id()]))
+    call('facets', 'get', reverse('product-facets') + f'?category={data.category_id()}')
+
+
+def search(call, data):
+    word = data.search_word()
+    call('search', 'get', reverse('product-list') + f'?q={word}')
+    call('search_facets', 'get', reverse('product-facets') + f'?q={word}')
+
+
+def cart(call, data):
+    call('add_to_cart', 'post', reverse('cart'), {'product': data.product_id(), 'quantity': 1}, expect=(200, 201))
+    call('view_cart', 'get', reverse('cart'))
+
+
+def checkout(call, data):
+    call('add_to_cart', 'post', reverse('cart'), {'product': data.product_id(in_stock=True), 'quantity': 1},
+         expect=(200, 201))
+    call('checkout', 'post', reverse('orders'), expect=(201,))
+    call('orders', 'get', reverse('orders'))
+
+
+def wishlist(call, data):
+    product_id = data.product_id()
+    call('wishlist_add', 'post', reverse('wishlist'), {'product_id': product_id}, expect=(200, 201))
+    call('wishlist', 'get', reverse('wishlist'))
+    call('wishlist_remove', 'delete', reverse('wishlist'), {'product_id': product_id}, expect=(200, 204))
+
+
+SCENARIOS = {
+    'browse': browse,
+    'search': search,
+    'cart': cart,
+    'checkout': checkout,
+    'wishlist': wishlist,
+}
+
+
+def run_scenarios(session, data, iterations, names=None, before_iteration=None):
+    """``{ssenariy: [iteratsiya qadamlari, ...]}`` qaytaradi."""
+    results = {}
+    for name in names or SCENARIOS:
+        results[name] = []
+        for _ in range(iterations):
+            recorder = Recorder(session)
+            if before_iteration:
+                before_iteration()
+            SCENARIOS[name](recorder, data)
+            results[name].append(recorder.steps)
+    return results
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)), 1) - 1]
+
+
+def _stats(timings, queries):
+    known = [count for count in queries if count is not None]
+    return {
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'p99_ms': round(percentile(timings, 0.99), 2),
+        'queries': max(known) if known else None,
+    }
+
+
+def summarize(results):
+    """Ssenariy (iteratsiya yig'indisi) va qadamlar bo'yicha persentillar."""
+    summary = {}
+    for name, iterations in results.items():
+        steps = {}
+        for iteration in iterations:
+            for step in iteration:
+                entry = steps.setdefault(step['step'], {'ms': [], 'queries': []})
+                entry['ms'].append(step['ms'])
+                entry['queries'].append(step['queries'])
+        totals = [sum(step['ms'] for step in iteration) for iteration in iterations]
+        queries = [
+            None if any(step['queries'] is None for step in iteration) else sum(step['queries'] for step in iteration)
+            for iteration in iterations
+        ]
+        summary[name] = {
+            **_stats(totals, queries),
+            'iterations': len(iterations),
+            'steps': {step: _stats(entry['ms'], entry['queries']) for step, entry in steps.items()},
+        }
+    return summary
+
+
+def calibrate(rounds=7):
+    """Mashina tezligi: ma'lumotga bog'liq bo'lmagan SQLite + JSON yuklamasi (mediana, ms)."""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        db = sqlite3.connect(':memory:')
+        db.execute('CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT, price REAL)')
+        db.executemany('INSERT INTO item VALUES (?, ?, ?)', ((pk, f'mahsulot {pk}', pk * 1.5) for pk in range(20000)))
+        rows = db.execute('SELECT id, name, price FROM item WHERE price > ? ORDER BY name', (100,)).fetchall()
+        json.dumps([{'id': pk, 'name': name, 'price': price} for pk, name, price in rows])
+        db.close()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 2)
+
+
+def compare(summary, baseline, calibration_ms=None):
+    """Baseline'dan oshib ketgan ko'rsatkichlar ro'yxati (bo'sh — regressiya yo'q).
+
+    So'rovlar soni har doim tekshiriladi. p95 esa faqat ikkala tomonda
+    ``calibrate()`` natijasi bo'lsa, mashinalar tezligi nisbatiga
+    moslashtirilib solishtiriladi — boshqa mashinadagi mutlaq ms bilan emas.
+    """
+    thresholds = baseline.get('thresholds', {})
+    latency_tolerance = thresholds.get('p95_tolerance', 0.25)
+    query_tolerance = thresholds.get('queries_tolerance', 0)
+    speed = None
+    if calibration_ms and baseline.get('calibration_ms'):
+        speed = calibration_ms / baseline['calibration_ms']
+    failures = []
+    for name, expected in baseline.get('scenarios', {}).items():
+        current = summary.get(name)
+        if current is None:
+            continue
+        if speed is not None:
+            limit = expected['p95_ms'] * speed * (1 + latency_tolerance)
+            if current['p95_ms'] > limit:
+                failures.append(f"{name}: p95 {current['p95_ms']} ms > {limit:.2f} ms")
+        if None not in (current['queries'], expected.get('queries')) \
+                and current['queries'] > expected['queries'] + query_tolerance:
+            failures.append(f"{name}: {current['queries']} so'rov > {expected['queries']}")
+    return failures
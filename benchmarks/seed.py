@@ -0,0 +1,134 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from shop.counters import refresh_counters
+from shop.models import Category, CategoryClosure, Product, ProductImage, UserProfile, CartItem, Order, Comment, Like, Rating
+from shop.popularity import refresh_popularity
+from shop.search import rebuild_index
+
+BATCH_SIZE = 10000
+
+# Qidiruv ssenariylari uchun turli nomlar
+ADJECTIVES = ['Qishki', 'Yozgi', 'Klassik', 'Sport', 'Bolalar', 'Charm', 'Paxta', 'Ipak']
+NOUNS = ['kurtka', 'etik', 'ko‘ylak', 'shim', 'sumka', 'shapka', 'sharf', 'krossovka']
+
+
+def _batched(objects, model):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == BATCH_SIZE:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def seed(products=1000, categories=50, users=100, orders=1000, comments=2000, cart_items=500,
+         images=0, likes=0, ratings=0, wishlist_items=0, seed_value=0, log=print):
+    """Benchmark uchun sintetik ma'lumot yaratadi (signallarsiz, bulk_create bilan).
+
+    Yaratilgan obyektlar id'lari bilan lug'at qaytaradi.
+    """
+    rng = random.Random(seed_value)
+    now = timezone.now()
+
+    _batched((Category(name=f'Kategoriya {i}', slug=f'bench-cat-{i}') for i in range(categories)), Category)
+    category_ids = list(Category.objects.values_list('pk', flat=True))
+    log(f'{len(category_ids)} ta kategoriya')
+
+    _batched((User(username=f'bench-user-{i}') for i in range(users)), User)
+    user_ids = list(User.objects.filter(username__startswith='bench-user-').values_list('pk', flat=True))
+    # bulk_create signal yubormaydi — profillarni o'zimiz yaratamiz
+    _batched((UserProfile(user_id=user_id) for user_id in user_ids), UserProfile)
+    log(f'{len(user_ids)} ta foydalanuvchi')
+
+    _batched((
+        Product(
+            category_id=rng.choice(category_ids),
+            name=f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}',
+            description=f'Benchmark mahsuloti {i}',
+            price=Decimal(rng.randrange(1000, 2000000)),
+            stock=rng.randrange(0, 500),
+            main_image='products/main/bench.jpg',
+            slug=f'bench-product-{i}',
+        )
+        for i in range(products)
+    ), Product)
+    product_ids = list(Product.objects.values_list('pk', flat=True))
+    log(f'{len(product_ids)} ta mahsulot')
+
+    _batched((
+        Order(user_id=rng.choice(user_ids), is_paid=rng.random() < 0.9)
+        for _ in range(orders)
+    ), Order)
+    # auto_now_add bulk_create'da bir xil vaqt beradi — tarixni yoyib chiqamiz
+    for offset, pk in enumerate(Order.objects.values_list('pk', flat=True).iterator()):
+        if offset % 97 == 0:
+            Order.objects.filter(pk=pk).update(created_at=now - timedelta(hours=offset))
+    log(f'{orders} ta buyurtma')
+
+    _batched((
+        Comment(user_id=rng.choice(user_ids), product_id=rng.choice(product_ids), text='Zo‘r mahsulot')
+        for _ in range(comments)
+    ), Comment)
+    log(f'{comments} ta izoh')
+
+    cart = {(rng.choice(user_ids), rng.choice(product_ids)) for _ in range(cart_items)}
+    _batched((
+        CartItem(user_id=user_id, product_id=product_id, quantity=rng.randrange(1, 5))
+        for user_id, product_id in cart
+    ), CartItem)
+    log(f'{len(cart)} ta savatcha qatori')
+
+    _batched((
+        ProductImage(product_id=rng.choice(product_ids), image='products/extra/bench.jpg')
+        for _ in range(images)
+    ), ProductImage)
+    log(f'{images} ta qo‘shimcha rasm')
+
+    pairs = {(rng.choice(user_ids), rng.choice(product_ids)) for _ in range(likes)}
+    _batched((Like(user_id=user_id, product_id=product_id) for user_id, product_id in pairs), Like)
+    log(f'{len(pairs)} ta layk')
+
+    pairs = {(rng.choice(user_ids), rng.choice(product_ids)) for _ in range(ratings)}
+    _batched((
+        Rating(user_id=user_id, product_id=product_id, stars=rng.randint(1, 5))
+        for user_id, product_id in pairs
+    ), Rating)
+    log(f'{len(pairs)} ta reyting')
+
+    profile_ids = dict(UserProfile.objects.filter(user_id__in=user_ids).values_list('user_id', 'pk'))
+    pairs = {(profile_ids[rng.choice(user_ids)], rng.choice(product_ids)) for _ in range(wishlist_items)}
+    through = UserProfile.wishlist.through
+    _batched((through(userprofile_id=profile_id, product_id=product_id) for profile_id, product_id in pairs),
+             through)
+    log(f'{len(pairs)} ta istaklar ro‘yxati qatori')
+
+    return {
+        'category_ids': category_ids,
+        'user_ids': user_ids,
+        'product_ids': product_ids,
+    }
+
+
+def existing_ids():
+    """Oldin to'ldirilgan baza (--keepdb) uchun ``seed()`` bilan bir xil lug'at."""
+    return {
+        'category_ids': list(Category.objects.values_list('pk', flat=True)),
+        'user_ids': list(User.objects.filter(username__startswith='bench-user-').values_list('pk', flat=True)),
+        'product_ids': list(Product.objects.values_list('pk', flat=True)),
+    }
+
+
+def rebuild_derived(log=print):
+    """bulk_create'dan keyin hisoblagichlar, kategoriya daraxti, qidiruv indeksi va ommaboplikni qayta quradi."""
+    refresh_counters()
+    CategoryClosure.objects.rebuild()
+    rebuild_index(Product.objects.all())
+    refresh_popularity(rebuild=True)
+    log('hisoblagichlar, kategoriya daraxti, qidiruv indeksi va ommaboplik qayta qurildi')
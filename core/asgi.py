@@ -3,6 +3,12 @@ ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The ``/api/async/...`` read endpoints (shop/async_views.py) only avoid
+blocking a worker when served through ASGI, e.g.::
+
+    uvicorn core.asgi:application --workers 4
+    gunicorn core.asgi:application -k uvicorn.workers.UvicornWorker
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -0,0 +1,66 @@
+"""``DATABASE_URL`` dan Django ``DATABASES`` yozuvini yasaydi.
+
+Qo'llab-quvvatlanadi: ``postgres://`` / ``postgresql://``,
+``sqlite:///nisbiy/yo'l``, ``sqlite:////mutlaq/yo'l`` va ``sqlite://:memory:``.
+URL'dagi query parametrlari (masalan ``?sslmode=require``) ``OPTIONS`` ga o'tadi.
+"""
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+# WAL — o'quvchilar yozuvchini kutmaydi; qolganlari lokal/test uchun tezlik
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL;'
+    'PRAGMA synchronous=NORMAL;'
+    'PRAGMA busy_timeout=5000;'
+    'PRAGMA temp_store=MEMORY;'
+    'PRAGMA cache_size=-20000;'
+    'PRAGMA mmap_size=134217728;'
+)
+
+ENGINES = {
+    'postgres': 'django.db.backends.postgresql',
+    'postgresql': 'django.db.backends.postgresql',
+    'pgsql': 'django.db.backends.postgresql',
+    'sqlite': 'django.db.backends.sqlite3',
+}
+
+
+def sqlite_config(name):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'OPTIONS': {
+            'init_command': SQLITE_PRAGMAS,
+            # Yozuvchi tranzaksiya boshidanoq qulfni oladi — WAL'da "database is locked" kamayadi
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+
+
+def parse_database_url(url, conn_max_age=0, health_checks=True, pool=None):
+    """``pool`` — psycopg pool sozlamalari (lug'at); berilsa ``CONN_MAX_AGE`` 0 bo'ladi."""
+    parts = urlsplit(url)
+    if parts.scheme not in ENGINES:
+        raise ValueError(f"Qo'llab-quvvatlanmaydigan DATABASE_URL sxemasi: {parts.scheme!r}")
+
+    if ENGINES[parts.scheme] == 'django.db.backends.sqlite3':
+        # sqlite:///nisbiy.db, sqlite:////mutlaq/yo'l.db
+        in_memory = parts.netloc == ':memory:' or parts.path in ('', '/')
+        config = sqlite_config(':memory:' if in_memory else unquote(parts.path[1:]))
+    else:
+        config = {
+            'ENGINE': ENGINES[parts.scheme],
+            'NAME': unquote(parts.path.lstrip('/')),
+            'USER': unquote(parts.username or ''),
+            'PASSWORD': unquote(parts.password or ''),
+            'HOST': parts.hostname or '',
+            'PORT': str(parts.port or ''),
+            'OPTIONS': dict(parse_qsl(parts.query)),
+        }
+        if pool:
+            # Django pooling va doimiy ulanishlarni birga qo'llamaydi
+            config['OPTIONS']['pool'] = pool
+            conn_max_age = 0
+
+    config['CONN_MAX_AGE'] = conn_max_age
+    config['CONN_HEALTH_CHECKS'] = health_checks
+    return config
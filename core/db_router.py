@@ -0,0 +1,55 @@
+"""Asosiy/replika marshrutlash.
+
+Yozuvlar va oddiy o'qishlar har doim ``default`` bazaga boradi. Replikaga
+faqat ``read_from_replica()`` ichida (yoki ``ReplicaReadMixin`` li view'ning
+GET/HEAD so'rovlarida) o'qiladi — replikadagi kechikish foydalanuvchi
+o'zi yozgan ma'lumotni ko'rmay qolishiga olib kelmasligi uchun.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica')]
+
+
+@contextmanager
+def read_from_replica():
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaReadMixin:
+    """Faqat o'qiydigan so'rovlar (GET/HEAD/OPTIONS) replikadan o'qiydi."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replica():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get():
+            return 'default'
+        replicas = replica_aliases()
+        return random.choice(replicas) if replicas else 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replikalar asosiy bazaning nusxasi — bog'lanishlar doim mumkin
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from core.database import parse_database_url, sqlite_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -23,7 +26,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-)=e7dtbf95yvg_j$db+896($8^wrcdipdztj6w(f63!#2k0*fn'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DEBUG', 'True').lower() in ('1', 'true', 'yes')
 
 ALLOWED_HOSTS = ['*']
 
@@ -45,6 +48,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'shop.profiling.ProfilingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -76,13 +80,115 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DATABASE_URL bo'lmasa — WAL rejimidagi lokal SQLite (core/database.py)
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+# psycopg (3) pool: DB_POOL=1 bo'lsa CONN_MAX_AGE 0 bo'ladi
+DB_POOL = {
+    'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+    'timeout': 10,
+} if os.environ.get('DB_POOL') == '1' else None
+
+if os.environ.get('DATABASE_URL'):
+    DATABASES = {'default': parse_database_url(os.environ['DATABASE_URL'], DB_CONN_MAX_AGE, pool=DB_POOL)}
+else:
+    DATABASES = {'default': {**sqlite_config(BASE_DIR / 'db.sqlite3'), 'CONN_MAX_AGE': DB_CONN_MAX_AGE}}
+
+# Faqat o'qish uchun replikalar: vergul bilan ajratilgan URL'lar
+for index, url in enumerate(filter(None, os.environ.get('DATABASE_REPLICA_URLS', '').split(','))):
+    DATABASES[f'replica_{index}'] = {
+        **parse_database_url(url.strip(), DB_CONN_MAX_AGE, pool=DB_POOL),
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+
+# Cache
+# CACHE_URL: bo'sh (lokal xotira), file:///yo'l yoki redis://host:port/db
+
+CACHE_URL = os.environ.get('CACHE_URL', '')
+
+if CACHE_URL.startswith(('redis://', 'rediss://')):
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}}
+elif CACHE_URL.startswith('file://'):
+    CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_URL[len('file://'):] or BASE_DIR / '.cache',
+    }}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+# Har doim jarayon ichidagi kesh ham mavjud (masalan, token keshi uchun)
+CACHES['local'] = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'shop-local'}
+
+# Katalog javoblari keshi (shop/cache.py)
+SHOP_CACHE_ALIAS = 'default'
+SHOP_RESPONSE_CACHE_TIMEOUT = 300
+
+# Token keshi (shop/authentication.py): 'default' (umumiy) yoki 'local' (jarayon ichida)
+SHOP_AUTH_CACHE_ALIAS = os.environ.get('SHOP_AUTH_CACHE_ALIAS', 'default')
+SHOP_AUTH_CACHE_TIMEOUT = 300
+# Imzolangan (bazasiz) tokenlar: login javobida 'signed_token', sarlavha 'Signed <token>'
+SHOP_SIGNED_TOKENS = os.environ.get('SHOP_SIGNED_TOKENS', '') == '1'
+SHOP_SIGNED_TOKEN_MAX_AGE = 900
+
+# So'rov profillash (shop/profiling.py): 0..1 ulushdagi so'rovlar o'lchanadi
+SHOP_PROFILING_SAMPLE_RATE = float(os.environ.get('SHOP_PROFILING_SAMPLE_RATE', '0'))
+SHOP_PROFILING_SERVER_TIMING = DEBUG or os.environ.get('SHOP_PROFILING_SERVER_TIMING', '') == '1'
+SHOP_PROFILING_N_PLUS_ONE_THRESHOLD = 5
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'profiling': {
+            'class': 'logging.FileHandler' if os.environ.get('SHOP_PROFILING_LOG') else 'logging.StreamHandler',
+            **({'filename': os.environ['SHOP_PROFILING_LOG']} if os.environ.get('SHOP_PROFILING_LOG') else {}),
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        # Har bir qator — JSON (manage.py profiling_report uchun)
+        'shop.profiling': {'handlers': ['profiling'], 'level': 'INFO', 'propagate': False},
+    },
 }
 
+# Layk/reyting yozish yo'li (shop/engagement.py)
+SHOP_PRODUCT_EXISTS_TIMEOUT = 600
+SHOP_ENGAGEMENT_BUFFER = os.environ.get('SHOP_ENGAGEMENT_BUFFER', '') == '1'
+SHOP_ENGAGEMENT_BUFFER_SIZE = 500
+SHOP_ENGAGEMENT_FLUSH_INTERVAL = 2.0
+
+# Istaklar ro'yxati id'lari keshi (foydalanuvchi bo'yicha)
+SHOP_WISHLIST_CACHE_TIMEOUT = 600
+
+# Ommaboplik ballari (shop/popularity.py, refresh_popularity buyrug'i)
+SHOP_POPULARITY_EPOCH = '2025-01-01'
+SHOP_POPULARITY_HALF_LIFE_DAYS = 7
+SHOP_POPULARITY_WEIGHTS = {'orders': 3.0, 'likes': 1.0, 'ratings': 0.2, 'comments': 0.5}
+SHOP_POPULARITY_LAG = 60  # Soniya; tugallanmagan tranzaksiyalar uchun zaxira
+
+# "Bu bilan birga olishadi" (shop/recommendations.py, build_recommendations buyrug'i)
+SHOP_RECOMMENDATIONS_TOP_K = 10
+SHOP_RECOMMENDATIONS_CHUNK_SIZE = 5000  # Bir bo'lakdagi savatlar (buyurtma/profil) soni
+SHOP_RECOMMENDATIONS_MIN_SUPPORT = 2  # Kamida shuncha (og'irlikli) birga uchrash
+SHOP_RECOMMENDATIONS_MAX_BASKET = 50
+SHOP_RECOMMENDATIONS_WISHLIST_WEIGHT = 0.5
+
+# Qidiruv (shop/search.py): auto, sqlite_fts, postgres yoki terms
+SHOP_SEARCH_BACKEND = os.environ.get('SHOP_SEARCH_BACKEND', 'auto')
+# Qidiruv natijalari chegarasi; oshsa javobda search_truncated: true
+SHOP_SEARCH_MAX_RESULTS = 500
+
+# slug -> id LRU keshi hajmi (shop/slugs.py)
+SHOP_SLUG_CACHE_SIZE = 10000
+
+# Facet'lar uchun narx oraliqlari chegaralari (so'm)
+SHOP_FACET_PRICE_BOUNDARIES = [50000, 100000, 250000, 500000, 1000000]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -126,20 +232,35 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
+    # orjson (o'rnatilgan bo'lsa); Browsable API faqat DEBUG rejimida
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',  # Bu yerda Browsable API ni qo‘shamiz
+        'shop.renderers.ORJSONRenderer',
+    ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    'DEFAULT_PARSER_CLASSES': [
+        'shop.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'shop.authentication.CachedTokenAuthentication',
+        'shop.authentication.SignedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        # Layk, izoh va reyting yozish (foydalanuvchi bo'yicha)
+        'engagement': os.environ.get('SHOP_ENGAGEMENT_RATE', '30/min'),
+    },
+    'DEFAULT_PAGINATION_CLASS': 'shop.pagination.CreatedAtCursorPagination',
+    'PAGE_SIZE': 20,
 }
 
 
-import os
-
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Rasm nusxalari (shop/images.py): thread, sync yoki off
+SHOP_IMAGE_PROCESSING = os.environ.get('SHOP_IMAGE_PROCESSING', 'thread')
+SHOP_IMAGE_WORKERS = 2
+SHOP_IMAGE_VARIANTS = {'thumb': 160, 'small': 320, 'medium': 640, 'large': 1280}
@@ -4,8 +4,9 @@ from .models import Category, Product, ProductImage, UserProfile, Comment, Like,
 # 1️⃣ Kategoriya admini
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'description', 'created_at', 'updated_at')
+    list_display = ('name', 'parent', 'depth', 'created_at', 'updated_at')
     search_fields = ['name']
+    list_select_related = ('parent',)
     list_filter = ('created_at', 'updated_at')
 
 # 2️⃣ Mahsulot admini
@@ -0,0 +1,204 @@
+"""ASGI ostida ishlaydigan faqat-o'qish endpoint'lari (``/api/async/...``).
+
+Bu view'lar DRF'dan tashqarida: autentifikatsiya, kursor sahifalash va
+filtrlash shu yerda qayta yozilgan. Shu sababli ularga DRF throttling,
+javob keshi (``CachedResponseMixin``) va ``ProfilingMixin`` qo'llanmaydi —
+ular sinxron endpoint'larning o'rnini bosmaydi, faqat yuqori
+parallellikdagi o'qishlar uchun qo'shimcha yo'l.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.views import View
+from django_filters.utils import translate_validation
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+
+from .authentication import (
+    SignedTokenAuthentication, get_auth_cache, token_cache_key, user_from_snapshot, user_snapshot,
+)
+from .filters import ProductFilter
+from .models import Category, Product, Order
+from .pagination import CreatedAtCursorPagination, decode_keyset, encode_keyset, keyset_filter
+from .renderers import ORJSONRenderer
+from .serializers import CategorySerializer, ProductSerializer, OrderSerializer
+
+
+def json_response(data, status=200):
+    return HttpResponse(ORJSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def error_response(exc):
+    # exc — APIException klassi yoki nusxasi; ValidationError'da javob — xatolar lug'ati (DRF kabi)
+    if isinstance(exc, type):
+        exc = exc()
+    data = exc.detail if isinstance(exc, exceptions.ValidationError) else {'detail': exc.detail}
+    return json_response(data, status=exc.status_code)
+
+
+async def authenticate(request):
+    # DEFAULT_AUTHENTICATION_CLASSES'ning async nusxasi: Token (kesh) va Signed
+    parts = request.headers.get('Authorization', '').split()
+    if len(parts) != 2:
+        return None
+    scheme = parts[0].lower()
+    if scheme == SignedTokenAuthentication.keyword.lower():
+        if not getattr(settings, 'SHOP_SIGNED_TOKENS', False):
+            return None
+        # Imzoni tekshirish bazaga murojaat qilmaydi — sinxron kod to'g'ridan-to'g'ri
+        try:
+            user, _ = SignedTokenAuthentication().authenticate_credentials(parts[1])
+        except exceptions.AuthenticationFailed:
+            return None
+        return user
+    if scheme != 'token':
+        return None
+    cache = get_auth_cache()
+    snapshot = await cache.aget(token_cache_key(parts[1]))
+    if snapshot is None:
+        try:
+            token = await Token.objects.select_related('user').aget(key=parts[1])
+        except Token.DoesNotExist:
+            return None
+        snapshot = user_snapshot(token.user)
+        await cache.aset(token_cache_key(parts[1]), snapshot, getattr(settings, 'SHOP_AUTH_CACHE_TIMEOUT', 300))
+    user = user_from_snapshot(snapshot)
+    return user if user.is_active else None
+
+
+async def paginate(request, queryset, ordering=CreatedAtCursorPagination.ordering):
+    """Keyset sahifalash: ``(obyektlar, keyingi sahifa URL'i)`` qaytaradi."""
+    paginator = CreatedAtCursorPagination
+    try:
+        page_size = min(int(request.GET.get(paginator.page_size_query_param, paginator.page_size)),
+                        paginator.max_page_size)
+    except ValueError:
+        page_size = paginator.page_size
+    page_size = max(page_size, 1)
+
+    queryset = queryset.order_by(*ordering)
+    if request.GET.get('cursor'):
+        queryset = queryset.filter(keyset_filter(ordering, decode_keyset(request.GET['cursor'])))
+    items = [obj async for obj in queryset[:page_size + 1].aiterator(chunk_size=page_size + 1)]
+
+    next_url = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        params = request.GET.copy()
+        params['cursor'] = encode_keyset([getattr(items[-1], field.lstrip('-')) for field in ordering])
+        next_url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+    return items, next_url
+
+
+class AsyncListView(View):
+    """Async ORM (``aiterator``) bilan o'qiladigan ro'yxat; javob shakli DRF kursor sahifasiga mos."""
+    serializer_class = None
+    requires_auth = False
+
+    async def get_queryset(self, request, user):
+        raise NotImplementedError
+
+    def get_ordering(self, request):
+        return CreatedAtCursorPagination.ordering
+
+    def get_extra_data(self, request):
+        return {}
+
+    async def get(self, request, *args, **kwargs):
+        user = await authenticate(request)
+        if self.requires_auth and user is None:
+            return error_response(exceptions.NotAuthenticated)
+        try:
+            queryset = await self.get_queryset(request, user)
+        except exceptions.APIException as exc:
+            return error_response(exc)
+        try:
+            items, next_url = await paginate(request, queryset, self.get_ordering(request))
+        except ValueError:
+            return json_response({'detail': 'Invalid cursor'}, status=400)
+        data = self.serializer_class(items, many=True, context={'request': request}).data
+        return json_response({'next': next_url, 'results': data, **self.get_extra_data(request)})
+
+
+class AsyncDetailView(View):
+    serializer_class = None
+    requires_auth = False
+
+    async def get_queryset(self, request, user):
+        raise NotImplementedError
+
+    async def get(self, request, pk):
+        user = await authenticate(request)
+        if self.requires_auth and user is None:
+            return error_response(exceptions.NotAuthenticated)
+        queryset = await self.get_queryset(request, user)
+        try:
+            # aget() select_related/prefetch_related'ni ham bajaradi
+            obj = await queryset.aget(pk=pk)
+        except queryset.model.DoesNotExist:
+            return error_response(exceptions.NotFound)
+        return json_response(self.serializer_class(obj, context={'request': request}).data)
+
+
+class AsyncCategoryListView(AsyncListView):
+    serializer_class = CategorySerializer
+
+    async def get_queryset(self, request, user):
+        return Category.objects.all()
+
+
+class AsyncCategoryDetailView(AsyncDetailView):
+    serializer_class = CategorySerializer
+
+    async def get_queryset(self, request, user):
+        return Category.objects.all()
+
+
+class AsyncProductListView(AsyncListView):
+    serializer_class = ProductSerializer
+
+    async def get_queryset(self, request, user):
+        # Qidiruv filtri bazaga murojaat qiladi — ProductListView bilan bir xil filtrlar va 400 xatolari
+        return await sync_to_async(self.filter_queryset)(request)
+
+    def filter_queryset(self, request):
+        filterset = ProductFilter(request.GET, Product.objects.for_listing(), request=request)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return filterset.qs
+
+    def get_ordering(self, request):
+        # ProductListView.get_pagination_ordering bilan bir xil
+        if request.GET.get('ordering') == 'popular':
+            return ('-popularity_score', '-id')
+        if request.GET.get('q') or request.GET.get('name'):
+            return ('-search_rank', '-id')
+        return super().get_ordering(request)
+
+    def get_extra_data(self, request):
+        if hasattr(request, 'search_truncated'):
+            return {'search_truncated': request.search_truncated}
+        return {}
+
+
+class AsyncProductDetailView(AsyncDetailView):
+    serializer_class = ProductSerializer
+
+    async def get_queryset(self, request, user):
+        return Product.objects.for_listing()
+
+
+class AsyncWishlistView(AsyncListView):
+    serializer_class = ProductSerializer
+    requires_auth = True
+
+    async def get_queryset(self, request, user):
+        return Product.objects.for_listing().filter(wishlisted_by__user=user)
+
+
+class AsyncOrderListView(AsyncListView):
+    serializer_class = OrderSerializer
+    requires_auth = True
+
+    async def get_queryset(self, request, user):
+        return Order.objects.filter(user=user).prefetch_related('items__product')
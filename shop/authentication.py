@@ -0,0 +1,102 @@
+"""Token autentifikatsiyasi uchun kesh va imzolangan (stateless) tokenlar.
+
+``CachedTokenAuthentication`` DRF ``TokenAuthentication`` bilan bir xil
+``Authorization: Token <kalit>`` sarlavhasini qabul qiladi, lekin token ->
+foydalanuvchi moslamasini ``SHOP_AUTH_CACHE_ALIAS`` keshida
+``SHOP_AUTH_CACHE_TIMEOUT`` soniya saqlaydi. Yozuv token o'chirilganda va
+foydalanuvchi saqlanganda (signals.py) o'chiriladi. Lokal xotira keshida
+bu faqat joriy jarayonga ta'sir qiladi — boshqa jarayonlarda TTL tugashini
+kutadi; umumiy (redis) keshda darhol ta'sir qiladi.
+
+``SignedTokenAuthentication`` (``Authorization: Signed <token>``) bazaga
+umuman murojaat qilmaydi: foydalanuvchi ma'lumoti ``SECRET_KEY`` bilan
+imzolangan tokenning o'zida. Bunday tokenni chiqishda bekor qilib
+bo'lmaydi, shuning uchun muddati qisqa (``SHOP_SIGNED_TOKEN_MAX_AGE``).
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import caches
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+# Keshga va imzolangan tokenga yoziladigan maydonlar (parol xeshi emas)
+SNAPSHOT_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name', 'is_active', 'is_staff', 'is_superuser')
+SIGNING_SALT = 'shop.authentication.signed-token'
+
+
+def get_auth_cache():
+    return caches[getattr(settings, 'SHOP_AUTH_CACHE_ALIAS', 'default')]
+
+
+def token_cache_key(key):
+    return f'shop:auth:token:{key}'
+
+
+def user_snapshot(user):
+    return [getattr(user, field) for field in SNAPSHOT_FIELDS]
+
+
+def user_from_snapshot(values):
+    """Bazaga murojaatsiz ``User`` obyekti.
+
+    Qolgan maydonlar (parol va h.k.) "deferred" — kerak bo'lsa alohida
+    yuklanadi, ``save()`` esa faqat snapshot maydonlarini yozadi.
+    """
+    model = get_user_model()
+    snapshot = dict(zip(SNAPSHOT_FIELDS, values))
+    # from_db qiymatlarni model maydonlari tartibida kutadi
+    field_names = [field.attname for field in model._meta.concrete_fields if field.attname in snapshot]
+    return model.from_db('default', field_names, [snapshot[name] for name in field_names])
+
+
+def forget_token(key):
+    get_auth_cache().delete(token_cache_key(key))
+
+
+def forget_user_tokens(user_id):
+    for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True):
+        forget_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        cache = get_auth_cache()
+        snapshot = cache.get(token_cache_key(key))
+        if snapshot is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(token_cache_key(key), user_snapshot(user),
+                      getattr(settings, 'SHOP_AUTH_CACHE_TIMEOUT', 300))
+            return user, token
+
+        user = user_from_snapshot(snapshot)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        token = Token.from_db('default', ('key', 'user_id'), (key, user.pk))
+        token.user = user
+        return user, token
+
+
+def issue_signed_token(user):
+    return signing.dumps(user_snapshot(user), salt=SIGNING_SALT, compress=True)
+
+
+class SignedTokenAuthentication(TokenAuthentication):
+    keyword = 'Signed'
+
+    def authenticate(self, request):
+        if not getattr(settings, 'SHOP_SIGNED_TOKENS', False):
+            return None
+        return super().authenticate(request)
+
+    def authenticate_credentials(self, key):
+        try:
+            snapshot = signing.loads(key, salt=SIGNING_SALT,
+                                     max_age=getattr(settings, 'SHOP_SIGNED_TOKEN_MAX_AGE', 900))
+        except signing.BadSignature:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        user = user_from_snapshot(snapshot)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        return user, None
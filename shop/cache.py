@@ -0,0 +1,141 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Model
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def get_cache():
+    return caches[getattr(settings, 'SHOP_CACHE_ALIAS', 'default')]
+
+
+def _version_key(namespace):
+    return f'shop:version:{namespace}'
+
+
+def get_versions(namespaces):
+    """Har bir nom maydoni (namespace) uchun joriy versiya raqamini qaytaradi.
+
+    Kesh'da yo'q versiya vaqt belgisidan boshlanadi — shunda o'chib ketgan
+    versiya kaliti eski yozuvlarga qayta mos kelib qolmaydi.
+    """
+    cache = get_cache()
+    keys = [_version_key(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(namespaces):
+    cache = get_cache()
+    for namespace in namespaces:
+        key = _version_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate(*namespaces):
+    """Nom maydonlari versiyasini oshiradi — eski kalitlar shunchaki ishlatilmay qoladi.
+
+    Tranzaksiya commit bo'lgandan keyin yana bir bor oshiriladi, aks holda
+    commit'dan oldin o'qilgan eski ma'lumot yangi versiya ostida keshlanib qolishi mumkin.
+    """
+    _bump(namespaces)
+    transaction.on_commit(lambda: _bump(namespaces))
+
+
+def response_cache_key(request, namespaces):
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+        if value != ''
+    )
+    versions = get_versions(namespaces)
+    # Javobda build_absolute_uri havolalari (next, thumbnail, srcset) bor — host/sxema kalitga kiradi
+    origin = f'{request.scheme}://{request.get_host()}'
+    raw = repr((origin, request.path, params, list(zip(namespaces, versions))))
+    return 'shop:response:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+class CachedResponseMixin:
+    """Ochiq katalog GET javoblarini keshlaydi va ETag/Last-Modified qo'yadi.
+
+    Kalit sxema va host, so'rov yo'li, normallashtirilgan parametrlar va
+    ``cache_namespaces`` versiyalaridan tuziladi. ``cache_object_namespace`` berilsa, URL'dagi
+    obyekt id'si bilan alohida versiya ham qo'shiladi (masalan ``product:5``).
+    """
+    cache_namespaces = ()
+    cache_object_namespace = None
+
+    def get_cache_object_id(self):
+        return self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+
+    def get_cache_namespaces(self):
+        namespaces = list(self.cache_namespaces)
+        if self.cache_object_namespace:
+            namespaces.append(f'{self.cache_object_namespace}:{self.get_cache_object_id()}')
+        return namespaces
+
+    def get_serializer(self, *args, **kwargs):
+        # Last-Modified'ni qo'shimcha so'rovsiz hisoblash uchun obyektlarni eslab qolamiz
+        if args:
+            instance = args[0]
+            self._cached_instances = [instance] if isinstance(instance, Model) else instance
+        return super().get_serializer(*args, **kwargs)
+
+    def get_last_modified(self):
+        return max(
+            (obj.updated_at for obj in getattr(self, '_cached_instances', None) or ()),
+            default=None,
+        )
+
+    def get(self, request, *args, **kwargs):
+        key = response_cache_key(request, self.get_cache_namespaces())
+        etag = quote_etag(key.rsplit(':', 1)[1])
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return self._not_modified(etag)
+
+        cache = get_cache()
+        entry = cache.get(key)
+        if entry is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            last_modified = self.get_last_modified()
+            entry = {
+                'data': response.data,
+                'last_modified': last_modified.timestamp() if last_modified else None,
+            }
+            cache.set(key, entry, getattr(settings, 'SHOP_RESPONSE_CACHE_TIMEOUT', 300))
+        else:
+            response = Response(entry['data'])
+
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        if (
+            entry['last_modified'] is not None
+            and if_modified_since is not None
+            and 'If-None-Match' not in request.headers
+            and int(entry['last_modified']) <= if_modified_since
+        ):
+            return self._not_modified(etag)
+
+        response['ETag'] = etag
+        if entry['last_modified'] is not None:
+            response['Last-Modified'] = http_date(entry['last_modified'])
+        return response
+
+    def _not_modified(self, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        return response
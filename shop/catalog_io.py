@@ -0,0 +1,69 @@
+import csv
+import json
+import sys
+from contextlib import contextmanager
+from decimal import Decimal
+
+FIELDS = ['slug', 'name', 'description', 'price', 'stock', 'category', 'main_image']
+FORMATS = ('csv', 'jsonl')
+
+
+def detect_format(path, explicit=None):
+    if explicit:
+        return explicit
+    if path.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return 'csv'
+
+
+@contextmanager
+def open_stream(path, mode):
+    # '-' — stdin/stdout
+    if path == '-':
+        yield sys.stdin if 'r' in mode else sys.stdout
+    else:
+        with open(path, mode, encoding='utf-8', newline='') as stream:
+            yield stream
+
+
+def read_rows(stream, fmt, on_error):
+    """Qatorlarni birma-bir o'qiydi: ``(qator raqami, lug'at)`` generatori.
+
+    JSON sifatida o'qilmagan qator tashlab ketiladi va ``on_error(qator raqami, xabar)``
+    ga uzatiladi.
+    """
+    if fmt == 'csv':
+        for line_number, row in enumerate(csv.DictReader(stream), start=2):
+            yield line_number, row
+    else:
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                on_error(line_number, f"JSON xato: {exc}")
+                continue
+            yield line_number, row
+
+
+class RowWriter:
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == 'csv':
+            self.writer = csv.writer(stream)
+            self.writer.writerow(FIELDS)
+
+    def write(self, values):
+        if self.fmt == 'csv':
+            self.writer.writerow(values)
+        else:
+            row = dict(zip(FIELDS, values))
+            self.stream.write(json.dumps(row, ensure_ascii=False, default=_json_default) + '\n')
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} JSON emas')
@@ -0,0 +1,23 @@
+"""Kategoriya daraxti bo'yicha yordamchilar (``CategoryClosure`` ustida)."""
+from django.conf import settings
+from django.db.models import Count
+
+from .cache import get_cache, get_versions
+from .models import CategoryClosure
+
+
+def subtree_product_counts():
+    """``{kategoriya_id: daraxtidagi mahsulotlar soni}`` — bitta GROUP BY so'rovi.
+
+    Kalitga 'catalog' versiyasi kiradi — mahsulot yoki kategoriya qatori
+    o'zgarganda kesh eskiradi, layk yoki ommaboplik yangilanishida esa yo'q.
+    """
+    key = f"shop:category-counts:{get_versions(['catalog'])[0]}"
+    cache = get_cache()
+    counts = cache.get(key)
+    if counts is None:
+        counts = dict(
+            CategoryClosure.objects.order_by().values_list('ancestor_id').annotate(count=Count('descendant__products'))
+        )
+        cache.set(key, counts, getattr(settings, 'SHOP_RESPONSE_CACHE_TIMEOUT', 300))
+    return counts
@@ -0,0 +1,48 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Product, Like, Comment, Rating
+
+
+def _aggregate(model, expression):
+    # Bitta mahsulot uchun korrelyatsiyalangan subquery
+    return Coalesce(
+        Subquery(
+            model.objects.filter(product=OuterRef('pk'))
+            .order_by()
+            .values('product')
+            .annotate(value=expression)
+            .values('value'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def refresh_counters(product_ids=None):
+    """Mahsulot hisoblagichlarini Like/Comment/Rating jadvallaridan qayta hisoblaydi.
+
+    Bitta UPDATE so'rovi bilan bajariladi. ``product_ids`` berilsa, faqat
+    o'sha mahsulotlar yangilanadi. Yangilangan qatorlar sonini qaytaradi.
+    """
+    products = Product.objects.all()
+    if product_ids is not None:
+        products = products.filter(pk__in=product_ids)
+    return products.update(
+        likes_count=_aggregate(Like, Count('pk')),
+        comments_count=_aggregate(Comment, Count('pk')),
+        rating_sum=_aggregate(Rating, Sum('stars')),
+        rating_count=_aggregate(Rating, Count('pk')),
+    )
+
+
+def adjust_counters(product_id, **deltas):
+    """Hisoblagichlarni atomar ``F()`` ifodasi bilan o'zgartiradi (masalan ``likes_count=1``).
+
+    ``updated_at`` ham yangilanadi, chunki hisoblagichlar API javobining bir qismi.
+    """
+    Product.objects.filter(pk=product_id).update(
+        updated_at=timezone.now(),
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
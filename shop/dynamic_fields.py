@@ -0,0 +1,146 @@
+"""``?fields=`` va ``?expand=`` parametrlari bilan serializer maydonlarini tanlash.
+
+* ``fields=id,name,category.name`` — faqat shu maydonlar; nuqta orqali
+  ichki serializer maydonlari tanlanadi;
+* ``expand=category,images`` — ``Meta.expandable_fields`` dagi ichki
+  obyektlardan faqat sanab o'tilganlari joylanadi (``expand=`` bo'sh
+  bo'lsa — hech biri). ``fields`` bilan birga berilsa, ikkalasi birlashadi.
+
+Parametrlar berilmasa javob shakli o'zgarmaydi. ``optimize_queryset``
+tanlangan maydonlar uchun kerakli ustunlar (``only``) va bog'lanishlarni
+(``select_related`` / ``Prefetch``) qo'shadi.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework.serializers import ListSerializer
+
+
+# Har doim o'qiladigan ustunlar: aks holda sahifadagi har bir qator uchun alohida so'rov
+ROOT_COLUMNS = ('created_at', 'updated_at')
+
+
+def _split(value):
+    if value is None:
+        return None
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def _tree(paths):
+    # ['id', 'category.name'] -> {'id': [], 'category': ['name']}
+    tree = {}
+    for path in paths:
+        name, _, rest = path.partition('.')
+        tree.setdefault(name, [])
+        if rest:
+            tree[name].append(rest)
+    return tree
+
+
+class DynamicFieldsMixin:
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._requested = (fields, expand)
+
+    def _is_root(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, ListSerializer) and parent.parent is None)
+
+    def get_requested(self):
+        fields, expand = self._requested
+        if fields is None and expand is None and self._is_root():
+            request = self.context.get('request')
+            if request is not None:
+                params = getattr(request, 'query_params', request.GET)
+                fields, expand = _split(params.get('fields')), _split(params.get('expand'))
+        return fields, expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested, expand = self.get_requested()
+        if requested is None and expand is None:
+            return fields
+
+        expandable = getattr(self.Meta, 'expandable_fields', ())
+        requested_tree = _tree(requested) if requested is not None else None
+        expand_tree = _tree(expand or [])
+        selected = {}
+        for name, field in fields.items():
+            if requested_tree is not None:
+                keep = name in requested_tree or name in expand_tree
+            else:
+                keep = name not in expandable or name in expand_tree
+            if not keep:
+                continue
+            selected[name] = field
+            # Ichki serializer'ga qolgan yo'llarni uzatamiz
+            nested = getattr(field, 'child', field)
+            if isinstance(nested, DynamicFieldsMixin):
+                nested._requested = (
+                    (requested_tree or {}).get(name) or None,
+                    expand_tree.get(name) or None,
+                )
+        return selected
+
+    def optimize_queryset(self, queryset):
+        """Tanlangan maydonlar uchun ``only`` + ``select_related`` + ``Prefetch`` qo'shadi."""
+        columns = set()
+        queryset, trim = self._optimize(queryset, queryset.model, '', columns)
+        if trim:
+            queryset = queryset.only(*columns)
+        return queryset
+
+    def _optimize(self, queryset, model, prefix, columns, required=()):
+        # prefix ostida: select_related yo'llari va only() ustunlari yig'iladi
+        columns.add(prefix + model._meta.pk.name)
+        columns.update(prefix + name for name in required)
+        if prefix == '':
+            # Last-Modified sarlavhasi va CreatedAtCursorPagination kursori (created_at, id) uchun
+            concrete = {field.name for field in model._meta.concrete_fields}
+            columns.update(name for name in ROOT_COLUMNS if name in concrete)
+        column_map = getattr(self.Meta, 'field_columns', {})
+        trim = True
+
+        for name, field in self.fields.items():
+            if name in column_map:
+                columns.update(prefix + column for column in column_map[name])
+                continue
+            if field.source == '*':
+                trim = False
+                continue
+            nested = getattr(field, 'child', field)
+            source, _, rest = field.source.partition('.')
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                trim = False
+                continue
+
+            if not isinstance(nested, DynamicFieldsMixin):
+                if not model_field.concrete:
+                    trim = False
+                elif rest and model_field.is_relation:
+                    queryset = queryset.select_related(prefix + source)
+                    columns.update((prefix + source, f'{prefix}{source}__{rest.replace(".", "__")}'))
+                else:
+                    columns.add(prefix + source)
+                continue
+
+            related_model = model_field.related_model
+            if model_field.many_to_many or model_field.one_to_many:
+                # Ichki so'rov o'zi alohida only() bilan qisqartiriladi
+                child_columns = set()
+                required_child = (model_field.field.name,) if model_field.one_to_many else ()
+                child_queryset, child_trim = nested._optimize(
+                    related_model._default_manager.all(), related_model, '', child_columns, required_child
+                )
+                if child_trim:
+                    child_queryset = child_queryset.only(*child_columns)
+                queryset = queryset.prefetch_related(Prefetch(prefix + source, queryset=child_queryset))
+            else:
+                columns.add(prefix + source)
+                queryset = queryset.select_related(prefix + source)
+                queryset, nested_trim = nested._optimize(
+                    queryset, related_model, f'{prefix}{source}__', columns
+                )
+                trim = trim and nested_trim
+        return queryset, trim
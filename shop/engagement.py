@@ -0,0 +1,124 @@
+"""Layk va reytinglar uchun yozish yo'li.
+
+* ``product_exists`` — mahsulot mavjudligini keshdan tekshiradi, shunda
+  har bir layk/izoh uchun ``Product`` qatori o'qilmaydi;
+* ``EngagementBuffer`` — ``SHOP_ENGAGEMENT_BUFFER`` yoqilganda layk va
+  reytinglarni jarayon xotirasida (user, product) bo'yicha birlashtirib,
+  davriy ravishda bitta ``bulk_create`` (ON CONFLICT) bilan yozadi.
+  Hisoblagichlar har bir yozuv uchun emas, har flush'da bir marta
+  ``refresh_counters`` bilan yangilanadi — ommabop mahsulot qatori
+  uchun raqobat shu tariqa kamayadi.
+
+Buferdagi yozuvlar jarayon to'xtaganda (``atexit``) ham yoziladi, lekin
+jarayon "o'ldirilsa" oxirgi ``SHOP_ENGAGEMENT_FLUSH_INTERVAL`` soniyadagi
+yozuvlar yo'qolishi mumkin.
+"""
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .cache import get_cache, invalidate
+from .counters import refresh_counters
+from .models import Product, Like, Rating
+
+logger = logging.getLogger(__name__)
+
+
+def _exists_key(product_id):
+    return f'shop:product-exists:{product_id}'
+
+
+def product_exists(product_id):
+    cache = get_cache()
+    if cache.get(_exists_key(product_id)):
+        return True
+    # Yo'q mahsulot keshlanmaydi — yangi yaratilgan mahsulot darhol ko'rinadi
+    exists = Product.objects.filter(pk=product_id).exists()
+    if exists:
+        cache.set(_exists_key(product_id), True, getattr(settings, 'SHOP_PRODUCT_EXISTS_TIMEOUT', 600))
+    return exists
+
+
+def forget_product(product_id):
+    get_cache().delete(_exists_key(product_id))
+
+
+class EngagementBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._likes = set()
+        self._ratings = {}
+        self._timer = None
+
+    def __len__(self):
+        return len(self._likes) + len(self._ratings)
+
+    def add_like(self, user_id, product_id):
+        with self._lock:
+            self._likes.add((user_id, product_id))
+        self._schedule()
+
+    def add_rating(self, user_id, product_id, stars):
+        with self._lock:
+            # Bir foydalanuvchining oxirgi bahosi qoladi
+            self._ratings[(user_id, product_id)] = stars
+        self._schedule()
+
+    def _schedule(self):
+        if len(self) >= getattr(settings, 'SHOP_ENGAGEMENT_BUFFER_SIZE', 500):
+            self.flush()
+            return
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(getattr(settings, 'SHOP_ENGAGEMENT_FLUSH_INTERVAL', 2.0),
+                                              self._flush_in_thread)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_in_thread(self):
+        close_old_connections()
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Layk/reyting buferini yozib bo'lmadi")
+        finally:
+            close_old_connections()
+
+    def flush(self):
+        """Buferni bazaga yozadi; yozilgan yozuvlar sonini qaytaradi."""
+        with self._lock:
+            likes, ratings = self._likes, self._ratings
+            self._likes, self._ratings = set(), {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not likes and not ratings:
+            return 0
+
+        # O'chirilgan mahsulotlarga yozuvlar tashlab yuboriladi
+        product_ids = {product_id for _, product_id in likes} | {product_id for _, product_id in ratings}
+        product_ids = set(Product.objects.filter(pk__in=product_ids).values_list('pk', flat=True))
+        with transaction.atomic():
+            Like.objects.bulk_create(
+                [Like(user_id=user_id, product_id=product_id)
+                 for user_id, product_id in likes if product_id in product_ids],
+                ignore_conflicts=True, batch_size=500,
+            )
+            Rating.objects.bulk_create(
+                [Rating(user_id=user_id, product_id=product_id, stars=stars)
+                 for (user_id, product_id), stars in ratings.items() if product_id in product_ids],
+                update_conflicts=True, unique_fields=['user', 'product'], update_fields=['stars', 'updated_at'],
+                batch_size=500,
+            )
+            # bulk_create signal yubormaydi
+            refresh_counters(product_ids)
+        # Ro'yxatlar keshi tegilmaydi — hisoblagichlar TTL bilan yangilanadi
+        invalidate(*[f'product:{product_id}' for product_id in product_ids])
+        return len(likes) + len(ratings)
+
+
+engagement_buffer = EngagementBuffer()
+atexit.register(engagement_buffer.flush)
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.db.models import Case, Count, F, IntegerField, Value, When
+
+
+def _price_bucket(boundaries):
+    # i-chi oraliq: [boundaries[i-1], boundaries[i])
+    return Case(
+        *[When(price__lt=bound, then=Value(index)) for index, bound in enumerate(boundaries)],
+        default=Value(len(boundaries)),
+        output_field=IntegerField(),
+    )
+
+
+def _rating_bucket():
+    # floor(rating_sum / rating_count) — bo'lishsiz, indeksga mos solishtirish bilan
+    return Case(
+        When(rating_count=0, then=Value(0)),
+        *[When(rating_sum__gte=F('rating_count') * stars, then=Value(stars)) for stars in range(5, 0, -1)],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def compute_facets(queryset):
+    """Kategoriya, narx va reyting bo'yicha facet'larni bitta GROUP BY so'rovida hisoblaydi.
+
+    Baza (kategoriya × narx oralig'i × reyting) kubini qaytaradi, har bir
+    facet shu kubdan Python'da yig'iladi.
+    """
+    boundaries = settings.SHOP_FACET_PRICE_BOUNDARIES
+    cube = (
+        queryset.order_by()
+        .values('category_id', 'category__name', price_bucket=_price_bucket(boundaries),
+                rating_bucket=_rating_bucket())
+        .annotate(count=Count('pk'))
+    )
+
+    categories = {}
+    prices = [0] * (len(boundaries) + 1)
+    ratings = [0] * 6
+    total = 0
+    for row in cube:
+        category = categories.setdefault(
+            row['category_id'], {'id': row['category_id'], 'name': row['category__name'], 'count': 0}
+        )
+        category['count'] += row['count']
+        prices[row['price_bucket']] += row['count']
+        ratings[row['rating_bucket']] += row['count']
+        total += row['count']
+
+    edges = [None] + list(boundaries) + [None]
+    return {
+        'total': total,
+        'categories': sorted(categories.values(), key=lambda c: (-c['count'], c['id'])),
+        'price': [
+            {'min': edges[index], 'max': edges[index + 1], 'count': count}
+            for index, count in enumerate(prices)
+        ],
+        'rating': [{'stars': stars, 'count': count} for stars, count in enumerate(ratings)],
+    }
@@ -1,13 +1,65 @@
 # core/filters.py
 import django_filters
-from .models import Product
+from django.db.models import Case, F, FloatField, Value, When
+from .models import Category, CategoryClosure, Product
+from .search import search_limit, search_products
 
-class ProductFilter(django_filters.FilterSet):
-    name = django_filters.CharFilter(field_name='name', lookup_expr='icontains')
+class TreeFilterSet(django_filters.FilterSet):
+    """?subtree=<id> — kategoriya va uning avlodlari (CategoryClosure bo'yicha bitta indeksli subquery);
+    ?depth=N — subtree'dan (u bo'lmasa ildizdan) ko'pi bilan N daraja pastgacha."""
+    category_field = 'pk'
+    subtree = django_filters.NumberFilter(method='filter_subtree')
+    depth = django_filters.NumberFilter(method='filter_depth', min_value=0)
+
+    def filter_subtree(self, queryset, name, value):
+        links = CategoryClosure.objects.filter(ancestor_id=value)
+        depth = self.form.cleaned_data.get('depth')
+        if depth is not None:
+            links = links.filter(depth__lte=depth)
+        return queryset.filter(**{f'{self.category_field}__in': links.values('descendant_id')})
+
+    def filter_depth(self, queryset, name, value):
+        if self.form.cleaned_data.get('subtree') is not None:
+            return queryset  # filter_subtree'da nisbiy chuqurlik sifatida
+        path = 'depth' if self.category_field == 'pk' else f'{self.category_field}__depth'
+        return queryset.filter(**{f'{path}__lte': value})
+
+
+class CategoryFilter(TreeFilterSet):
+    class Meta:
+        model = Category
+        fields = ['subtree', 'depth']
+
+
+class ProductFilter(TreeFilterSet):
+    category_field = 'category'
+
+    q = django_filters.CharFilter(method='filter_search')
+    name = django_filters.CharFilter(method='filter_search')  # Eski parametr, endi indeks orqali
     category = django_filters.NumberFilter(field_name='category__id')
     price_min = django_filters.NumberFilter(field_name='price', lookup_expr='gte')
     price_max = django_filters.NumberFilter(field_name='price', lookup_expr='lte')
+    ordering = django_filters.ChoiceFilter(choices=[('popular', 'Ommabop')], method='filter_ordering')
 
     class Meta:
         model = Product
-        fields = ['name', 'category', 'price_min', 'price_max']
+        fields = ['q', 'name', 'category', 'subtree', 'depth', 'price_min', 'price_max', 'ordering']
+
+    def filter_search(self, queryset, name, value):
+        # Natijalar search_rank bilan belgilanadi — ProductListView shu bo'yicha tartiblaydi
+        hits = search_products(value)
+        if self.request is not None:
+            # Chegaraga yetilgan bo'lsa view javobga search_truncated qo'shadi
+            self.request.search_truncated = len(hits) >= search_limit()
+        if not hits:
+            return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+        return queryset.filter(pk__in=[pk for pk, _ in hits]).annotate(
+            search_rank=Case(
+                *[When(pk=pk, then=Value(float(score))) for pk, score in hits],
+                output_field=FloatField(),
+            )
+        )
+
+    def filter_ordering(self, queryset, name, value):
+        # popularity_score bo'yicha ProductListView tartiblaydi (popularity_score_idx)
+        return queryset.annotate(popularity_score=F('popularity__score')).filter(popularity_score__isnull=False)
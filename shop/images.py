@@ -0,0 +1,141 @@
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps
+
+from .cache import invalidate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VARIANTS = {'thumb': 160, 'small': 320, 'medium': 640, 'large': 1280}
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'SHOP_IMAGE_WORKERS', 2),
+            thread_name_prefix='shop-images',
+        )
+    return _executor
+
+
+def generate_variants(field_file):
+    """Rasmning o'lchamli nusxalarini WebP va JPEG formatida yaratadi.
+
+    Nusxalar asl fayl yonidagi ``variants/`` papkasiga yoziladi. EXIF va
+    boshqa metama'lumotlar ko'chirilmaydi (faqat yo'nalish qo'llanadi).
+    ``{'thumb': {'width': 160, 'webp': yo'l, 'jpeg': yo'l}, ...}`` qaytaradi.
+    """
+    storage = field_file.storage
+    directory = posixpath.join(posixpath.dirname(field_file.name), 'variants')
+    stem = posixpath.splitext(posixpath.basename(field_file.name))[0]
+
+    with storage.open(field_file.name, 'rb') as source:
+        image = Image.open(source)
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    variants = {}
+    for label, size in getattr(settings, 'SHOP_IMAGE_VARIANTS', DEFAULT_VARIANTS).items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        variant = {'width': resized.width}
+        for extension, (pil_format, options) in FORMATS.items():
+            buffer = BytesIO()
+            frame = resized.convert('RGB') if pil_format == 'JPEG' else resized
+            frame.save(buffer, pil_format, **options)
+            variant[extension] = storage.save(
+                posixpath.join(directory, f'{stem}_{label}.{extension}'), ContentFile(buffer.getvalue())
+            )
+        variants[label] = variant
+    return variants
+
+
+def delete_variants(storage, variants):
+    for label, variant in variants.items():
+        if label == 'source':
+            continue
+        for extension in FORMATS:
+            if variant.get(extension):
+                storage.delete(variant[extension])
+
+
+def process_image(model_label, pk, image_field, variants_field):
+    model = apps.get_model(model_label)
+    obj = model.objects.filter(pk=pk).first()
+    if obj is None:
+        return
+    field_file = getattr(obj, image_field)
+    previous = getattr(obj, variants_field) or {}
+    if not field_file or previous.get('source') == field_file.name:
+        return
+
+    variants = generate_variants(field_file)
+    variants['source'] = field_file.name
+    # Fayl shu orada almashtirilgan bo'lsa, eski natijani yozmaymiz
+    updated = model.objects.filter(pk=pk, **{image_field: field_file.name}).update(**{variants_field: variants})
+    if updated:
+        delete_variants(field_file.storage, previous)
+    else:
+        delete_variants(field_file.storage, variants)
+
+    product_id = obj.pk if model_label == 'shop.Product' else obj.product_id
+    invalidate('products', f'product:{product_id}')
+
+
+def _run(task_args):
+    close_old_connections()
+    try:
+        process_image(*task_args)
+    except Exception:
+        logger.exception("Rasm nusxalarini yaratib bo'lmadi: %s", task_args)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(instance, image_field, variants_field):
+    """Tranzaksiya commit bo'lgach nusxalarni fon oqimida (yoki sinxron) yaratadi.
+
+    ``SHOP_IMAGE_PROCESSING``: ``'thread'`` (standart), ``'sync'`` yoki ``'off'``.
+    """
+    field_file = getattr(instance, image_field)
+    if not field_file or (getattr(instance, variants_field) or {}).get('source') == field_file.name:
+        return
+    mode = getattr(settings, 'SHOP_IMAGE_PROCESSING', 'thread')
+    if mode == 'off':
+        return
+    task_args = (instance._meta.label, instance.pk, image_field, variants_field)
+    if mode == 'sync':
+        transaction.on_commit(lambda: process_image(*task_args))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run, task_args))
+
+
+def build_srcset(variants, request=None):
+    """Serializer uchun ``{'thumb': {'width': 160, 'webp': url, 'jpeg': url}, ...}``."""
+    srcset = {}
+    for label, variant in (variants or {}).items():
+        if label == 'source':
+            continue
+        urls = {'width': variant['width']}
+        for extension in FORMATS:
+            url = default_storage.url(variant[extension])
+            urls[extension] = request.build_absolute_uri(url) if request else url
+        srcset[label] = urls
+    return srcset
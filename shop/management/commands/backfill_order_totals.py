@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from shop.models import Product, Order, OrderItem
+
+
+def _sum(field, output_field):
+    # Bitta buyurtma elementlari bo'yicha korrelyatsiyalangan yig'indi
+    return Coalesce(
+        Subquery(
+            OrderItem.objects.filter(order=OuterRef('pk'))
+            .order_by()
+            .values('order')
+            .annotate(value=Sum(field))
+            .values('value'),
+            output_field=output_field,
+        ),
+        0,
+        output_field=output_field,
+    )
+
+
+def _batches(queryset, batch_size):
+    # pk bo'yicha keyset — har bir partiya alohida tranzaksiyada
+    last_pk = 0
+    while True:
+        ids = list(queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+        yield ids
+        last_pk = ids[-1]
+
+
+class Command(BaseCommand):
+    help = "Eski buyurtmalar uchun unit_price, line_total, total_amount va item_count'ni partiyalab to'ldiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # 1. Narx saqlanmagan elementlar: buyurtma paytidagi narx noma'lum — joriy narx olinadi
+        items = 0
+        for ids in _batches(OrderItem.objects.filter(line_total__isnull=True), batch_size):
+            with transaction.atomic():
+                OrderItem.objects.filter(pk__in=ids, unit_price__isnull=True).update(
+                    unit_price=Subquery(Product.objects.filter(pk=OuterRef('product_id')).values('price')[:1])
+                )
+                OrderItem.objects.filter(pk__in=ids).update(
+                    line_total=ExpressionWrapper(
+                        F('unit_price') * F('quantity'),
+                        output_field=DecimalField(max_digits=12, decimal_places=2),
+                    )
+                )
+            items += len(ids)
+            self.stderr.write(f"{items} ta element")
+
+        # 2. Buyurtma summalari
+        orders = 0
+        for ids in _batches(Order.objects.filter(total_amount__isnull=True), batch_size):
+            with transaction.atomic():
+                Order.objects.filter(pk__in=ids).update(
+                    total_amount=_sum('line_total', DecimalField(max_digits=12, decimal_places=2)),
+                    item_count=_sum('quantity', IntegerField()),
+                )
+            orders += len(ids)
+            self.stderr.write(f"{orders} ta buyurtma")
+
+        self.stdout.write(self.style.SUCCESS(f"To'ldirildi: {items} ta element, {orders} ta buyurtma"))
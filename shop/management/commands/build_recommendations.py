@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from shop.recommendations import build_recommendations, sparse
+
+
+class Command(BaseCommand):
+    help = "Buyurtma va istaklar bo'yicha \"bu bilan birga olishadi\" jadvalini qayta quradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int)
+        parser.add_argument('--chunk-size', type=int)
+        parser.add_argument('--min-support', type=float)
+
+    def handle(self, *args, **options):
+        created = build_recommendations(options['top_k'], options['chunk_size'], options['min_support'])
+        engine = 'scipy.sparse' if sparse is not None else 'Counter'
+        self.stdout.write(self.style.SUCCESS(f"{created} ta tavsiya yozildi ({engine})"))
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from shop.catalog_io import FORMATS, RowWriter, detect_format, open_stream
+from shop.models import Product
+
+
+class Command(BaseCommand):
+    help = "Mahsulotlarni CSV yoki JSON Lines formatida eksport qiladi (xotira sarfi o'zgarmas)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Fayl yo'li yoki stdout uchun '-'")
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        fmt = detect_format(options['path'], options['format'])
+        rows = (
+            Product.objects.order_by('pk')
+            .values_list('slug', 'name', 'description', 'price', 'stock', 'category__slug', 'main_image')
+            .iterator(chunk_size=options['chunk_size'])
+        )
+        started = time.monotonic()
+        count = 0
+        with open_stream(options['path'], 'w') as stream:
+            writer = RowWriter(stream, fmt)
+            for row in rows:
+                writer.write(row)
+                count += 1
+
+        elapsed = time.monotonic() - started
+        self.stderr.write(f"{count} ta mahsulot eksport qilindi, {elapsed:.1f} s ({count / max(elapsed, 1e-9):.0f} qator/s)")
@@ -0,0 +1,131 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from shop.cache import invalidate
+from shop.catalog_io import FORMATS, detect_format, open_stream, read_rows
+from shop.models import Category, CategoryClosure, Product
+from shop.popularity import ensure_rows
+from shop.search import index_products
+
+UPDATE_FIELDS = ['name', 'description', 'price', 'stock', 'category', 'main_image', 'updated_at']
+
+
+class ProductRowSerializer(serializers.Serializer):
+    slug = serializers.SlugField(max_length=50)
+    name = serializers.CharField(max_length=200)
+    description = serializers.CharField(allow_blank=True, default='')
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    stock = serializers.IntegerField(min_value=0, default=0)
+    category = serializers.SlugField(max_length=50)
+    main_image = serializers.CharField(allow_blank=True, default='')
+
+
+class Command(BaseCommand):
+    help = "Mahsulotlarni CSV yoki JSON Lines faylidan slug bo'yicha import qiladi (yaratadi yoki yangilaydi)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Fayl yo'li yoki stdin uchun '-'")
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--create-categories', action='store_true',
+                            help="Noma'lum kategoriya sluglari uchun kategoriya yaratish")
+        parser.add_argument('--strict', action='store_true', help="Birinchi xatoda to'xtash")
+
+    def handle(self, *args, **options):
+        self.create_categories = options['create_categories']
+        self.strict = options['strict']
+        # Kategoriya slug -> id xaritasi bir marta yuklanadi
+        self.categories = dict(Category.objects.values_list('slug', 'pk'))
+        self.stats = {'created': 0, 'updated': 0, 'errors': 0}
+
+        started = time.monotonic()
+        processed = 0
+        chunk = []
+        with open_stream(options['path'], 'r') as stream:
+            rows = read_rows(stream, detect_format(options['path'], options['format']), self.error)
+            for line_number, row in rows:
+                chunk.append((line_number, row))
+                if len(chunk) == options['chunk_size']:
+                    processed += self.import_chunk(chunk)
+                    chunk = []
+                    self.report(processed, started)
+            if chunk:
+                processed += self.import_chunk(chunk)
+
+        self.report(processed, started)
+        self.stdout.write(self.style.SUCCESS(
+            f"Yaratildi: {self.stats['created']}, yangilandi: {self.stats['updated']}, xato: {self.stats['errors']}"
+        ))
+
+    def report(self, processed, started):
+        elapsed = time.monotonic() - started
+        self.stderr.write(f"{processed} qator, {elapsed:.1f} s ({processed / max(elapsed, 1e-9):.0f} qator/s)")
+
+    def error(self, line_number, message):
+        self.stats['errors'] += 1
+        if self.strict:
+            raise CommandError(f"{line_number}-qator: {message}")
+        self.stderr.write(f"{line_number}-qator: {message}")
+
+    def validate(self, chunk):
+        rows = {}
+        missing_categories = set()
+        for line_number, row in chunk:
+            serializer = ProductRowSerializer(data=row)
+            if not serializer.is_valid():
+                self.error(line_number, serializer.errors)
+                continue
+            data = serializer.validated_data
+            if data['category'] not in self.categories:
+                if not self.create_categories:
+                    self.error(line_number, f"kategoriya topilmadi: {data['category']}")
+                    continue
+                missing_categories.add(data['category'])
+            rows[data['slug']] = data  # Bir slug takrorlansa, oxirgisi qoladi
+        if missing_categories:
+            Category.objects.bulk_create(
+                [Category(name=slug, slug=slug) for slug in missing_categories], ignore_conflicts=True
+            )
+            self.categories.update(Category.objects.filter(slug__in=missing_categories).values_list('slug', 'pk'))
+            # Yangi kategoriyalar ildiz: daraxt jadvalida faqat o'zi bilan bog'lanish
+            CategoryClosure.objects.bulk_create(
+                [CategoryClosure(ancestor_id=self.categories[slug], descendant_id=self.categories[slug], depth=0)
+                 for slug in missing_categories],
+                ignore_conflicts=True,
+            )
+        return rows
+
+    def import_chunk(self, chunk):
+        rows = self.validate(chunk)
+        if not rows:
+            return len(chunk)
+        now = timezone.now()
+        with transaction.atomic():
+            existing = dict(Product.objects.filter(slug__in=rows).values_list('slug', 'pk'))
+            to_create, to_update = [], []
+            for slug, data in rows.items():
+                product = Product(
+                    pk=existing.get(slug),
+                    slug=slug,
+                    name=data['name'],
+                    description=data['description'],
+                    price=data['price'],
+                    stock=data['stock'],
+                    category_id=self.categories[data['category']],
+                    main_image=data['main_image'],
+                    updated_at=now,
+                )
+                (to_update if product.pk else to_create).append(product)
+            Product.objects.bulk_create(to_create, batch_size=500)
+            Product.objects.bulk_update(to_update, UPDATE_FIELDS, batch_size=500)
+            # bulk_* signal yubormaydi — qidiruv indeksini o'zimiz yangilaymiz
+            index_products(Product.objects.filter(slug__in=rows))
+            ensure_rows()
+        invalidate('products', 'catalog', *[f'product:{product.pk}' for product in to_update])
+        self.stats['created'] += len(to_create)
+        self.stats['updated'] += len(to_update)
+        return len(chunk)
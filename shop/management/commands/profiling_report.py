@@ -0,0 +1,72 @@
+import json
+import math
+import sys
+from collections import defaultdict
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def percentile(values, fraction):
+    # Eng yaqin rang (nearest-rank) usuli
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)), 1) - 1]
+
+
+class Command(BaseCommand):
+    help = "shop.profiling JSON loglaridan endpoint bo'yicha p50/p95/p99 hisobotini chiqaradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=['-'], help="Log fayllari yoki stdin uchun '-'")
+        parser.add_argument('--sort', choices=['p50', 'p95', 'p99', 'count'], default='p95')
+        parser.add_argument('--min-count', type=int, default=1)
+        parser.add_argument('--json', action='store_true', help="Natijani JSON sifatida chiqarish")
+
+    def handle(self, *args, **options):
+        records = defaultdict(list)
+        for path in options['paths']:
+            try:
+                stream = nullcontext(sys.stdin) if path == '-' else open(path, encoding='utf-8')
+            except OSError as exc:
+                raise CommandError(exc)
+            with stream as lines:
+                for line in lines:
+                    # Formatter prefiksi bo'lsa, JSON birinchi '{' dan boshlanadi
+                    start = line.find('{')
+                    if start == -1:
+                        continue
+                    try:
+                        record = json.loads(line[start:])
+                    except ValueError:
+                        continue
+                    if 'endpoint' in record and 'total_ms' in record:
+                        records[(record['method'], record['endpoint'])].append(record)
+
+        report = []
+        for (method, endpoint), rows in records.items():
+            if len(rows) < options['min_count']:
+                continue
+            totals = [row['total_ms'] for row in rows]
+            report.append({
+                'endpoint': f'{method} {endpoint}',
+                'count': len(rows),
+                'p50': percentile(totals, 0.50),
+                'p95': percentile(totals, 0.95),
+                'p99': percentile(totals, 0.99),
+                'queries': round(sum(row['queries'] for row in rows) / len(rows), 1),
+                'db_ms': round(sum(row['db_ms'] for row in rows) / len(rows), 2),
+                'serializer_ms': round(sum(row.get('serializer_ms', 0) for row in rows) / len(rows), 2),
+                'n_plus_one': sum(1 for row in rows if row.get('n_plus_one')),
+            })
+        report.sort(key=lambda row: row[options['sort']], reverse=True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+            return
+        header = f"{'endpoint':<45} {'soni':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'so‘rov':>7} {'db ms':>8} {'ser ms':>8} {'N+1':>5}"
+        self.stdout.write(header)
+        for row in report:
+            self.stdout.write(
+                f"{row['endpoint']:<45} {row['count']:>6} {row['p50']:>9.1f} {row['p95']:>9.1f} {row['p99']:>9.1f} "
+                f"{row['queries']:>7} {row['db_ms']:>8} {row['serializer_ms']:>8} {row['n_plus_one']:>5}"
+            )
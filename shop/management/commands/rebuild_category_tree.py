@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from shop.cache import invalidate
+from shop.models import CategoryClosure
+
+
+class Command(BaseCommand):
+    help = "Kategoriya daraxti jadvalini (CategoryClosure) va chuqurliklarni parent ustunidan qayta quradi"
+
+    def handle(self, *args, **options):
+        rows = CategoryClosure.objects.rebuild()
+        invalidate('categories', 'products', 'catalog')
+        self.stdout.write(self.style.SUCCESS(f"{rows} ta bog'lanish yozildi"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from shop.counters import refresh_counters
+
+
+class Command(BaseCommand):
+    help = "Mahsulot hisoblagichlarini (like, izoh, reyting) qayta hisoblaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--product', type=int, action='append', dest='product_ids',
+            help="Faqat shu mahsulot(lar)ni qayta hisoblash",
+        )
+
+    def handle(self, *args, **options):
+        updated = refresh_counters(options['product_ids'])
+        self.stdout.write(self.style.SUCCESS(f"{updated} ta mahsulot yangilandi"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from shop.models import Product
+from shop.search import get_backend, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Mahsulotlar qidiruv indeksini noldan quradi"
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        rebuild_index(Product.objects.all())
+        self.stdout.write(self.style.SUCCESS(
+            f"{Product.objects.count()} ta mahsulot indekslandi ({type(backend).__name__})"
+        ))
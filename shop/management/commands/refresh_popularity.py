@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from shop.popularity import SOURCES, refresh_popularity
+
+
+class Command(BaseCommand):
+    help = "Mahsulot ommaboplik ballarini oxirgi watermark'dan keyingi hodisalar bo'yicha yangilaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--source', choices=list(SOURCES), action='append', dest='sources')
+        parser.add_argument('--rebuild', action='store_true', help="Ballarni noldan qayta hisoblash")
+
+    def handle(self, *args, **options):
+        counts = refresh_popularity(options['batch_size'], options['rebuild'], options['sources'])
+        summary = ', '.join(f"{source}: {count}" for source, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Yangilandi ({summary})"))
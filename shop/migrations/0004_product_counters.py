@@ -0,0 +1,57 @@
+# Generated by Django 5.2.1 on 2026-10-18 08:55
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_counters(apps, schema_editor):
+    Product = apps.get_model('shop', 'Product')
+    Like = apps.get_model('shop', 'Like')
+    Comment = apps.get_model('shop', 'Comment')
+    Rating = apps.get_model('shop', 'Rating')
+
+    likes = dict(Like.objects.values_list('product').annotate(n=Count('pk')))
+    comments = dict(Comment.objects.values_list('product').annotate(n=Count('pk')))
+    ratings = {
+        row['product']: row
+        for row in Rating.objects.values('product').annotate(total=Sum('stars'), n=Count('pk'))
+    }
+    for pk in set(likes) | set(comments) | set(ratings):
+        rating = ratings.get(pk, {})
+        Product.objects.filter(pk=pk).update(
+            likes_count=likes.get(pk, 0),
+            comments_count=comments.get(pk, 0),
+            rating_sum=rating.get('total') or 0,
+            rating_count=rating.get('n', 0),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0003_order_orderitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
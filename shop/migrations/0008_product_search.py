@@ -0,0 +1,130 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:01
+
+import re
+from collections import defaultdict
+from itertools import islice
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# shop/search.py dan nusxa: migratsiya keyingi o'zgarishlarga bog'liq bo'lmasligi uchun
+FTS_TABLE = 'shop_product_fts'
+PG_TABLE = 'shop_product_search'
+NAME_WEIGHT, CATEGORY_WEIGHT, DESCRIPTION_WEIGHT = 3.0, 2.0, 1.0
+
+_APOSTROPHES = re.compile(r"[‘’ʻʼ'`]")
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize(text):
+    return _APOSTROPHES.sub('', text or '').lower()
+
+
+def tokenize(text):
+    return [token[:64] for token in _TOKEN.findall(normalize(text))]
+
+
+def _backend_name(connection):
+    name = getattr(settings, 'SHOP_SEARCH_BACKEND', 'auto')
+    if name != 'auto':
+        return name
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if cursor.fetchone()[0]:
+                return 'sqlite_fts'
+    elif connection.vendor == 'postgresql':
+        return 'postgres'
+    return 'terms'
+
+
+def _chunks(rows, size=500):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def build_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    Product = apps.get_model('shop', 'Product')
+    ProductSearchTerm = apps.get_model('shop', 'ProductSearchTerm')
+    rows = (
+        Product.objects.using(connection.alias)
+        .values_list('pk', 'name', 'description', 'category__name')
+        .iterator(chunk_size=2000)
+    )
+    backend = _backend_name(connection)
+
+    if backend == 'sqlite_fts':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                f"USING fts5(name, description, category, tokenize='unicode61 remove_diacritics 2')"
+            )
+            for chunk in _chunks(rows):
+                cursor.executemany(
+                    f"INSERT INTO {FTS_TABLE} (rowid, name, description, category) VALUES (%s, %s, %s, %s)",
+                    [(pk, normalize(name), normalize(description), normalize(category))
+                     for pk, name, description, category in chunk],
+                )
+    elif backend == 'postgres':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {PG_TABLE} ("
+                f"product_id bigint PRIMARY KEY REFERENCES shop_product (id) ON DELETE CASCADE, "
+                f"document tsvector NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {PG_TABLE}_document_idx ON {PG_TABLE} USING GIN (document)"
+            )
+            for chunk in _chunks(rows):
+                cursor.executemany(
+                    f"INSERT INTO {PG_TABLE} (product_id, document) VALUES (%s, "
+                    f"setweight(to_tsvector('simple', %s), 'A') || "
+                    f"setweight(to_tsvector('simple', %s), 'B') || "
+                    f"setweight(to_tsvector('simple', %s), 'C')) ON CONFLICT (product_id) DO NOTHING",
+                    [(pk, normalize(name), normalize(category), normalize(description))
+                     for pk, name, description, category in chunk],
+                )
+    else:
+        for chunk in _chunks(rows):
+            terms = []
+            for pk, name, description, category in chunk:
+                weights = defaultdict(float)
+                for text, weight in ((name, NAME_WEIGHT), (category, CATEGORY_WEIGHT),
+                                     (description, DESCRIPTION_WEIGHT)):
+                    for token in tokenize(text):
+                        weights[token] += weight
+                terms += [ProductSearchTerm(term=term, product_id=pk, weight=weight) for term, weight in weights.items()]
+            ProductSearchTerm.objects.using(connection.alias).bulk_create(terms, batch_size=1000)
+
+
+def drop_search_tables(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+            cursor.execute(f'DROP TABLE IF EXISTS {PG_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0007_orderitem_unit_price'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.FloatField()),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='shop.product')),
+            ],
+            options={
+                'unique_together': {('term', 'product')},
+            },
+        ),
+        migrations.RunPython(build_search_index, drop_search_tables),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_rows(apps, schema_editor):
+    # Har bir mahsulot uchun 0 balli qator; ballarni refresh_popularity hisoblaydi
+    Product = apps.get_model('shop', 'Product')
+    ProductPopularity = apps.get_model('shop', 'ProductPopularity')
+    ProductPopularity.objects.bulk_create(
+        (ProductPopularity(product_id=pk) for pk in Product.objects.values_list('pk', flat=True).iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0011_order_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PopularityWatermark',
+            fields=[
+                ('source', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProductPopularity',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='popularity', serialize=False, to='shop.product')),
+                ('score', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-score', '-product'], name='popularity_score_idx')],
+            },
+        ),
+        migrations.RunPython(create_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-18 09:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_self_links(apps, schema_editor):
+    # Hozirgi kategoriyalar tekis — har biri ildiz, faqat o'zi bilan bog'lanish (depth=0)
+    Category = apps.get_model('shop', 'Category')
+    CategoryClosure = apps.get_model('shop', 'CategoryClosure')
+    CategoryClosure.objects.bulk_create(
+        (CategoryClosure(ancestor_id=pk, descendant_id=pk, depth=0)
+         for pk in Category.objects.values_list('pk', flat=True).iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0013_product_recommendations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='children', to='shop.category'),
+        ),
+        migrations.CreateModel(
+            name='CategoryClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='shop.category')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='shop.category')),
+            ],
+            options={
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(create_self_links, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    Rating = apps.get_model('shop', 'Rating')
+    PopularityWatermark = apps.get_model('shop', 'PopularityWatermark')
+    Rating.objects.update(updated_at=F('created_at'))
+    # Reytinglar endi (updated_at, id) bo'yicha o'qiladi — hisoblangan qatorlar qayta qo'shilmasin
+    watermark = PopularityWatermark.objects.filter(source='ratings', last_id__gt=0).first()
+    if watermark is not None:
+        last = Rating.objects.filter(pk__lte=watermark.last_id).order_by('-created_at', '-pk').first()
+        if last is not None:
+            watermark.last_time, watermark.last_id = last.created_at, last.pk
+            watermark.save(update_fields=['last_time', 'last_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0014_category_tree'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='popularitywatermark',
+            name='last_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='rating',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['updated_at', 'id'], name='rating_updated_idx'),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -1,26 +1,129 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
-from django.utils.text import slugify
+from .slugs import unique_slug
 
 # 1️⃣ Kategoriya
 class Category(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(unique=True, blank=True)
     description = models.TextField(blank=True, null=True)  # Qo'shimcha maydon
+    # Bo'lim -> kategoriya -> subkategoriya; ichida bola bor kategoriya o'chirilmaydi
+    parent = models.ForeignKey('self', on_delete=models.PROTECT, null=True, blank=True, related_name='children')
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)  # Ildiz — 0
     created_at = models.DateTimeField(auto_now_add=True)  # Yaratilgan sanasi
     updated_at = models.DateTimeField(auto_now=True)  # Yangilangan sanasi
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Ko'chirishni save() da aniqlash uchun (only() bilan yuklanmagan bo'lsa — save() o'qiydi)
+        if 'parent_id' in instance.__dict__:
+            instance._saved_parent_id = instance.parent_id
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+            self.slug = unique_slug(self, self.name, 'category')
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'parent' not in update_fields and 'parent_id' not in update_fields:
+            return super().save(*args, **kwargs)
+
+        created = self._state.adding
+        if not created and not hasattr(self, '_saved_parent_id'):
+            self._saved_parent_id = Category.objects.filter(pk=self.pk).values_list('parent_id', flat=True).first()
+        moved = not created and self.parent_id != self._saved_parent_id
+
+        with transaction.atomic():
+            if created or moved:
+                ancestors = CategoryClosure.objects.ancestors(self.parent_id)
+                if moved and any(ancestor_id == self.pk for ancestor_id, _ in ancestors):
+                    raise ValueError("Kategoriyani o'z avlodi ostiga ko'chirib bo'lmaydi")
+                self.depth = len(ancestors)
+            super().save(*args, **kwargs)
+            if created:
+                CategoryClosure.objects.insert_node(self, ancestors)
+            elif moved:
+                CategoryClosure.objects.move_subtree(self, ancestors)
+        self._saved_parent_id = self.parent_id
 
     def __str__(self):
         return self.name
 
 
+class CategoryClosureManager(models.Manager):
+    def ancestors(self, category_id):
+        """``[(ajdod_id, masofa), ...]`` — ``category_id`` ning o'zi ham (0); ildiz ota uchun ``[]``."""
+        if category_id is None:
+            return []
+        return list(self.filter(descendant_id=category_id).values_list('ancestor_id', 'depth'))
+
+    def insert_node(self, category, ancestors):
+        self.bulk_create(
+            [self.model(ancestor_id=category.pk, descendant_id=category.pk, depth=0)]
+            + [self.model(ancestor_id=ancestor_id, descendant_id=category.pk, depth=depth + 1)
+               for ancestor_id, depth in ancestors]
+        )
+
+    def move_subtree(self, category, ancestors):
+        subtree = list(self.filter(ancestor=category).values_list('descendant_id', 'depth'))
+        subtree_ids = [descendant_id for descendant_id, _ in subtree]
+        # Eski ajdodlar bilan bog'lanishlar (daraxt ichidagilari qoladi)
+        self.filter(descendant_id__in=subtree_ids).exclude(ancestor_id__in=subtree_ids).delete()
+        self.bulk_create([
+            self.model(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=up + down + 1)
+            for ancestor_id, up in ancestors
+            for descendant_id, down in subtree
+        ], batch_size=1000)
+        levels = {}
+        for descendant_id, down in subtree:
+            levels.setdefault(down, []).append(descendant_id)
+        for down, ids in levels.items():
+            Category.objects.filter(pk__in=ids).update(depth=len(ancestors) + down)
+
+    def rebuild(self):
+        """``parent`` ustunidan butun jadvalni qayta quradi (bulk_create'dan keyin). Qatorlar sonini qaytaradi."""
+        parents = dict(Category.objects.values_list('pk', 'parent_id'))
+        rows, depths = [], {}
+        for category_id in parents:
+            node, distance = category_id, 0
+            while node is not None and distance <= len(parents):
+                rows.append(self.model(ancestor_id=node, descendant_id=category_id, depth=distance))
+                node, distance = parents[node], distance + 1
+            depths[category_id] = distance - 1
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(rows, batch_size=1000)
+            by_depth = {}
+            for category_id, depth in depths.items():
+                by_depth.setdefault(depth, []).append(category_id)
+            for depth, ids in by_depth.items():
+                Category.objects.filter(pk__in=ids).exclude(depth=depth).update(depth=depth)
+        return len(rows)
+
+
+# Har bir (ajdod, avlod) juftligi, o'zi bilan ham (depth=0): daraxt bo'yicha so'rovlar bitta JOIN
+class CategoryClosure(models.Model):
+    ancestor = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveSmallIntegerField()  # ancestor'dan descendant'gacha darajalar soni
+
+    objects = CategoryClosureManager()
+
+    class Meta:
+        unique_together = ['ancestor', 'descendant']
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+
 
 # 2️⃣ Mahsulot
+class ProductQuerySet(models.QuerySet):
+    def for_listing(self):
+        # ProductSerializer uchun kerakli bog'lanishlarni oldindan yuklaydi
+        return self.select_related('category').prefetch_related('images')
+
+
 class Product(models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='products')
     name = models.CharField(max_length=200)
@@ -28,10 +131,47 @@ class Product(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField(default=0)
     main_image = models.ImageField(upload_to='products/main/')
+    main_image_variants = models.JSONField(default=dict, blank=True, editable=False)  # shop/images.py
     slug = models.SlugField(unique=True, blank=True)  # Slug maydonini qo'shish
+    # Hisoblagichlar (signals.py orqali yangilanadi, rebuild_counters bilan qayta hisoblanadi)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='product_created_idx'),
+            # ProductFilter: category + price_min/price_max, facet'lar
+            models.Index(fields=['category', 'price'], name='product_category_price_idx'),
+            models.Index(fields=['price'], name='product_price_idx'),
+        ]
+
+    # Faqat F() bilan (shop/counters.py) yangilanadi
+    COUNTER_FIELDS = ('likes_count', 'comments_count', 'rating_sum', 'rating_count')
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = unique_slug(self, self.name, 'product')
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            # Eskirgan nusxa (admin, serializer) signallar yangilagan hisoblagichlarni qaytarib yozmasin
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def average_rating(self):
+        if self.rating_count:
+            return round(self.rating_sum / self.rating_count, 2)
+        return 0
+
     def __str__(self):
         return self.name
 
@@ -41,6 +181,7 @@ class Product(models.Model):
 class ProductImage(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='product_images/')
+    variants = models.JSONField(default=dict, blank=True, editable=False)  # shop/images.py
     created_at = models.DateTimeField(auto_now_add=True)  # Qo'shimcha maydon
 
     def __str__(self):
@@ -48,7 +189,7 @@ class ProductImage(models.Model):
 
 # 4️⃣ Foydalanuvchi profili
 class UserProfile(models.Model):
-    user = models.OneToOneField(User, on_delete=models.CASCADE)
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     bio = models.TextField(blank=True, null=True)  # Bio maydoni
     wishlist = models.ManyToManyField(Product, blank=True, related_name='wishlisted_by')
     created_at = models.DateTimeField(auto_now_add=True)  # Yaratilgan sanasi
@@ -65,6 +206,11 @@ class Comment(models.Model):
     text = models.TextField()  # 'content' ni o'rniga 'text' maydoni
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['product', '-created_at', '-id'], name='comment_product_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.product.name}"
 
@@ -87,9 +233,13 @@ class Rating(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='ratings')
     stars = models.PositiveIntegerField()  # 1 to 5
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Qayta baholash — refresh_popularity watermark'i
 
     class Meta:
         unique_together = ['user', 'product']
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='rating_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} rated {self.product.name} - {self.stars}★"
@@ -102,6 +252,10 @@ class CartItem(models.Model):
 
     class Meta:
         unique_together = ['user', 'product']
+        indexes = [
+            # Savatcha va checkout: user bo'yicha (product_id, quantity) jadvalga tegmasdan o'qiladi
+            models.Index(fields=['user', 'product', 'quantity'], name='cartitem_user_covering_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.product.name} ({self.quantity})"
@@ -111,6 +265,19 @@ class Order(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='orders')
     created_at = models.DateTimeField(auto_now_add=True)
     is_paid = models.BooleanField(default=False)
+    # Checkout paytida yoziladi; eski buyurtmalar uchun backfill_order_totals (NULL — hali hisoblanmagan)
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    item_count = models.PositiveIntegerField(null=True, blank=True)  # Dona soni (quantity yig'indisi)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='order_user_created_idx'),
+            # To'lanmagan buyurtmalar kam — qisman indeks kichik bo'lib qoladi
+            models.Index(
+                fields=['user', '-created_at'], condition=models.Q(is_paid=False),
+                name='order_user_unpaid_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} by {self.user.username}"
@@ -119,6 +286,59 @@ class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField()
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)  # Buyurtma paytidagi narx
+    line_total = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)  # unit_price * quantity
 
     def __str__(self):
         return f"{self.product.name} ({self.quantity})"
+
+
+# 🔟 Qidiruv indeksi (TermIndexBackend uchun, shop/search.py)
+class ProductSearchTerm(models.Model):
+    term = models.CharField(max_length=64)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='search_terms')
+    weight = models.FloatField()
+
+    class Meta:
+        unique_together = ['term', 'product']
+
+
+# 1️⃣1️⃣ Ommaboplik (shop/popularity.py, refresh_popularity buyrug'i bilan yangilanadi)
+class ProductPopularity(models.Model):
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='popularity')
+    # Vaqt bo'yicha "shishirilgan" ball: eski qiymatlarni qayta yozmasdan so'nish bilan teng tartib
+    score = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score', '-product'], name='popularity_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}: {self.score}"
+
+
+class PopularityWatermark(models.Model):
+    source = models.CharField(max_length=32, primary_key=True)  # 'orders', 'likes', ...
+    last_id = models.BigIntegerField(default=0)  # Shu id'gacha bo'lgan qatorlar hisoblangan
+    last_time = models.DateTimeField(null=True, blank=True)  # Vaqt bo'yicha manbalar: (last_time, last_id)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} <= {self.last_id}"
+
+
+# 1️⃣2️⃣ "Bu bilan birga olishadi" (shop/recommendations.py, build_recommendations buyrug'i)
+class ProductRecommendation(models.Model):
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='recommendations')
+    related = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='recommended_for')
+    rank = models.PositiveSmallIntegerField()  # 0 — eng o'xshash
+    score = models.FloatField()  # Kosinus o'xshashligi
+
+    class Meta:
+        # /products/<pk>/related/ shu indeks bo'yicha o'qiladi
+        unique_together = ['product', 'rank']
+
+    def __str__(self):
+        return f"{self.product_id} -> {self.related_id} ({self.score:.3f})"
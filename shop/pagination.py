@@ -0,0 +1,48 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """(created_at, id) bo'yicha keyset sahifalash.
+
+    Kursor shaffof emas (base64), OFFSET o'rniga indeks bo'yicha qidiradi,
+    shuning uchun sahifa narxi jadval hajmiga bog'liq emas.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        # View so'rovga qarab boshqa kalitni tanlashi mumkin (masalan qidiruv reytingi)
+        get_pagination_ordering = getattr(view, 'get_pagination_ordering', None)
+        ordering = get_pagination_ordering() if get_pagination_ordering else None
+        return ordering or super().get_ordering(request, queryset, view)
+
+
+# Async view'lar uchun (DRF paginatori sinxron) — (maydon, id) juftligi bo'yicha keyset
+def encode_keyset(values):
+    # isoformat mikrosekundlarni saqlaydi (DjangoJSONEncoder ularni kesib tashlaydi)
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values]).encode()
+    return urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_keyset(token):
+    try:
+        values = json.loads(urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def keyset_filter(ordering, values):
+    """``('-created_at', '-id')`` tartibida ``values`` dan keyingi qatorlar sharti."""
+    (first, second), (first_value, second_value) = [field.lstrip('-') for field in ordering], values
+    lookup = 'lt' if ordering[0].startswith('-') else 'gt'
+    return Q(**{f'{first}__{lookup}': first_value}) | Q(**{first: first_value, f'{second}__{lookup}': second_value})
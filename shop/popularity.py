@@ -0,0 +1,141 @@
+"""Mahsulot ommabopligi (``ProductPopularity``) — inkremental hisoblash.
+
+Har bir hodisa (buyurtma qatori, layk, reyting, izoh) ballga
+``og'irlik * miqdor * 2 ** ((vaqt - epoxa) / yarim_umr)`` qo'shadi.
+Bu "so'nish"ning teskarisi: eski ballarni har safar kamaytirish o'rniga
+yangi hodisalar kattaroq og'irlik bilan kiradi, shuning uchun tartib
+istalgan paytda so'nuvchi ball bilan bir xil, lekin hech qaysi qator
+qayta yozilmaydi. Ko'rsatkich taxminan ``1000 * yarim_umr`` dan oshsa
+float to'lib ketadi — undan oldin ``SHOP_POPULARITY_EPOCH`` ni surib,
+``refresh_popularity --rebuild`` ishlatiladi.
+
+Har bir manba uchun ``PopularityWatermark`` saqlanadi — keyingi ishga
+tushishda faqat undan keyingi qatorlar o'qiladi. Buyurtma, layk va izohlar
+faqat qo'shiladi, ular uchun ``last_id`` yetarli. Reyting esa
+``update_or_create`` bilan o'zgaradi — u ``(updated_at, id)`` bo'yicha
+o'qiladi. Qayta baholash yangi hodisa sifatida yangi yulduzlar bilan
+qo'shiladi; eski baho ayirilmaydi, vaqt bilan so'nadi.
+
+Oxirgi ``SHOP_POPULARITY_LAG`` soniyadagi qatorlar keyingi safarga
+qoldiriladi: id (yoki ``updated_at``) tranzaksiya commit bo'lishidan
+oldin beriladi. Tranzaksiyasi ``LAG`` dan uzoq davom etgan qator, undan
+kattaroq kalit watermark'dan o'tib ketgan bo'lsa, butunlay tushib qoladi.
+``LAG`` ni eng uzun yozish tranzaksiyasidan katta qo'ying va davriy
+(masalan haftasiga) ``--rebuild`` bilan bunday yo'qotishlarni tiklang.
+
+O'chirilgan layk/izohlar balldan ayirilmaydi — ular ham vaqt bilan so'nadi.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.utils import timezone
+
+from .cache import invalidate
+from .models import Product, ProductPopularity, PopularityWatermark, OrderItem, Like, Rating, Comment
+from .pagination import keyset_filter
+
+# manba -> (model, vaqt maydoni, miqdor maydoni yoki None, vaqt bo'yicha watermark)
+SOURCES = {
+    'orders': (OrderItem, 'order__created_at', 'quantity', False),
+    'likes': (Like, 'created_at', None, False),
+    'ratings': (Rating, 'updated_at', 'stars', True),
+    'comments': (Comment, 'created_at', None, False),
+}
+
+DEFAULT_WEIGHTS = {'orders': 3.0, 'likes': 1.0, 'ratings': 0.2, 'comments': 0.5}
+
+# Bitta UPDATE ichidagi CASE shartlari (SQLite parametr chegarasi)
+UPDATE_CHUNK = 300
+
+
+def _epoch():
+    epoch = datetime.fromisoformat(getattr(settings, 'SHOP_POPULARITY_EPOCH', '2025-01-01'))
+    return epoch if epoch.tzinfo else epoch.replace(tzinfo=dt_timezone.utc)
+
+
+def inflate(when, epoch=None):
+    half_life = getattr(settings, 'SHOP_POPULARITY_HALF_LIFE_DAYS', 7) * 86400
+    return 2 ** ((when - (epoch or _epoch())).total_seconds() / half_life)
+
+
+def ensure_rows():
+    """bulk_create bilan yaratilgan (signalsiz) mahsulotlar uchun yetishmayotgan qatorlar."""
+    missing = Product.objects.filter(popularity__isnull=True).values_list('pk', flat=True)
+    ProductPopularity.objects.bulk_create(
+        (ProductPopularity(product_id=pk) for pk in missing.iterator()), batch_size=1000, ignore_conflicts=True
+    )
+
+
+def _apply(deltas):
+    now = timezone.now()
+    items = list(deltas.items())
+    for start in range(0, len(items), UPDATE_CHUNK):
+        chunk = items[start:start + UPDATE_CHUNK]
+        ProductPopularity.objects.filter(product_id__in=[pk for pk, _ in chunk]).update(
+            score=F('score') + Case(
+                *[When(product_id=pk, then=Value(delta)) for pk, delta in chunk],
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+            updated_at=now,
+        )
+
+
+def refresh_source(source, cutoff, batch_size=1000):
+    """Bitta manbaning watermark'dan keyingi qatorlarini qo'shadi; qayta ishlangan qatorlar soni."""
+    model, time_field, amount_field, by_time = SOURCES[source]
+    weight = getattr(settings, 'SHOP_POPULARITY_WEIGHTS', DEFAULT_WEIGHTS).get(source, 0.0)
+    fields = ['pk', 'product_id', time_field] + ([amount_field] if amount_field else [])
+    epoch = _epoch()
+
+    watermark, _ = PopularityWatermark.objects.get_or_create(source=source)
+    last_id, last_time, processed = watermark.last_id, watermark.last_time, 0
+    while True:
+        if by_time:
+            # (updated_at, id) keyset — rating_updated_idx
+            queryset = model.objects.filter(**{f'{time_field}__lt': cutoff}).order_by(time_field, 'pk')
+            if last_time is not None:
+                queryset = queryset.filter(keyset_filter((time_field, 'pk'), (last_time, last_id)))
+        else:
+            queryset = model.objects.filter(pk__gt=last_id).order_by('pk')
+        rows = list(queryset.values_list(*fields)[:batch_size])
+        # pk tartibida birinchi "yangi" qatorda to'xtaymiz — watermark bo'shliq qoldirmaydi
+        fresh = []
+        for row in rows:
+            if row[2] >= cutoff:
+                break
+            fresh.append(row)
+        if not fresh:
+            return processed
+
+        deltas = defaultdict(float)
+        for row in fresh:
+            amount = row[3] if amount_field else 1
+            deltas[row[1]] += weight * amount * inflate(row[2], epoch)
+        last_id = fresh[-1][0]
+        if by_time:
+            last_time = fresh[-1][2]
+        with transaction.atomic():
+            _apply(deltas)
+            PopularityWatermark.objects.filter(source=source).update(last_id=last_id, last_time=last_time)
+        processed += len(fresh)
+        if len(fresh) < batch_size:
+            return processed
+
+
+def refresh_popularity(batch_size=1000, rebuild=False, sources=None):
+    """``{manba: qatorlar soni}`` qaytaradi."""
+    if rebuild:
+        with transaction.atomic():
+            ProductPopularity.objects.update(score=0.0)
+            PopularityWatermark.objects.all().delete()
+    ensure_rows()
+
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'SHOP_POPULARITY_LAG', 60))
+    counts = {source: refresh_source(source, cutoff, batch_size) for source in sources or SOURCES}
+    if any(counts.values()) or rebuild:
+        invalidate('products')
+    return counts
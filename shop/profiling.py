@@ -0,0 +1,215 @@
+"""So'rov darajasidagi profillash.
+
+``ProfilingMiddleware`` tanlangan (``SHOP_PROFILING_SAMPLE_RATE``) so'rovlar
+uchun SQL so'rovlar soni va vaqtini ``connection.execute_wrapper`` orqali
+yig'adi, ``ProfilingMixin`` esa DRF view'larida serializer va render
+vaqtini qo'shadi. Natija:
+
+* ``Server-Timing`` sarlavhasi (``SHOP_PROFILING_SERVER_TIMING``);
+* ``shop.profiling`` logger'iga bitta JSON qator —
+  ``manage.py profiling_report`` shu qatorlardan p50/p95/p99 hisoblaydi.
+
+Middleware sinxron va async zanjirda ham ishlaydi (``/api/async/...``
+view'lari oqim adapteridan o'tmaydi); ``SHOP_PROFILING_SAMPLE_RATE`` 0 bo'lsa
+zanjirga umuman qo'shilmaydi.
+
+Bir xil SQL shabloni ``SHOP_PROFILING_N_PLUS_ONE_THRESHOLD`` martadan ko'p
+bajarilsa, bu N+1 belgisi sifatida logda ``n_plus_one`` ro'yxatiga tushadi
+va yozuv WARNING darajasida chiqadi.
+"""
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('shop.profiling')
+
+_current = ContextVar('shop_profile', default=None)
+
+
+def current_profile():
+    return _current.get()
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.render_time = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper uchun
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def repeated_queries(self):
+        threshold = getattr(settings, 'SHOP_PROFILING_N_PLUS_ONE_THRESHOLD', 5)
+        return [
+            {'sql': sql[:500], 'count': count}
+            for sql, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+    def server_timing(self, total):
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serializer_time * 1000:.1f}',
+            f'render;dur={self.render_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+
+def _wrap_connections(profile):
+    # Joriy oqimdagi ulanishlar; ochiq ExitStack qaytadi
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(profile))
+    return stack
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if getattr(settings, 'SHOP_PROFILING_SAMPLE_RATE', 0.0) <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        return random.random() < getattr(settings, 'SHOP_PROFILING_SAMPLE_RATE', 0.0)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        try:
+            with _wrap_connections(profile):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        # Async ORM so'rovlari sync_to_async oqimida bajariladi — wrapper o'sha oqim ulanishlariga
+        stack = await sync_to_async(_wrap_connections)(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current.reset(token)
+        return self.finish(request, response, profile)
+
+    def finish(self, request, response, profile):
+        total = time.perf_counter() - profile.started
+        if getattr(settings, 'SHOP_PROFILING_SERVER_TIMING', False):
+            response['Server-Timing'] = profile.server_timing(total)
+        self.log(request, response, profile, total)
+        return response
+
+    def log(self, request, response, profile, total):
+        match = request.resolver_match
+        repeated = profile.repeated_queries()
+        record = {
+            'method': request.method,
+            'endpoint': f'/{match.route}' if match else request.path,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_ms': round(profile.db_time * 1000, 2),
+            'queries': profile.queries,
+            'serializer_ms': round(profile.serializer_time * 1000, 2),
+            'render_ms': round(profile.render_time * 1000, 2),
+            'n_plus_one': repeated,
+        }
+        logger.log(logging.WARNING if repeated else logging.INFO, json.dumps(record, ensure_ascii=False))
+
+
+def _timed(profile, method, *args, **kwargs):
+    started = time.perf_counter()
+    db_before = profile.db_time
+    try:
+        return method(*args, **kwargs)
+    finally:
+        # Serializer ichidagi lazy so'rovlar DB vaqtiga kiradi
+        profile.serializer_time += time.perf_counter() - started - (profile.db_time - db_before)
+
+
+@lru_cache(maxsize=None)
+def _timed_serializer_class(serializer_class):
+    # .data (to_representation) va is_valid() vaqtini o'lchaydigan voris klass
+    class TimedSerializer(serializer_class):
+        @property
+        def data(self):
+            profile = current_profile()
+            if profile is None:
+                return super().data
+            return _timed(profile, lambda: super(TimedSerializer, self).data)
+
+        def is_valid(self, *args, **kwargs):
+            profile = current_profile()
+            if profile is None:
+                return super().is_valid(*args, **kwargs)
+            return _timed(profile, super().is_valid, *args, **kwargs)
+
+    TimedSerializer.__name__ = serializer_class.__name__
+    TimedSerializer.__qualname__ = serializer_class.__qualname__
+    return TimedSerializer
+
+
+class ProfilingMixin:
+    """DRF view'lari uchun: serializer va render vaqtini joriy profilga yozadi.
+
+    ``GenericAPIView`` da ``get_serializer()`` o'zi o'tkazadi; serializer'ni
+    to'g'ridan-to'g'ri yaratadigan ``APIView`` lar uni ``profile_serializer()``
+    orqali o'tkazadi.
+    """
+
+    def profile_serializer(self, serializer):
+        if current_profile() is not None:
+            serializer.__class__ = _timed_serializer_class(type(serializer))
+        return serializer
+
+    def get_serializer(self, *args, **kwargs):
+        return self.profile_serializer(super().get_serializer(*args, **kwargs))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        profile = current_profile()
+        if profile is not None and hasattr(response, 'add_post_render_callback'):
+            started = time.perf_counter()
+
+            def rendered(response):
+                profile.render_time += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
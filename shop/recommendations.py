@@ -0,0 +1,165 @@
+""""Bu bilan birga olishadi" — mahsulotlar o'xshashligi.
+
+Savat (buyurtma) va istaklar ro'yxati — "savat". Ikkala manba bo'laklab
+(``SHOP_RECOMMENDATIONS_CHUNK_SIZE`` ta savat) o'qiladi va birgalikda
+uchrash matritsasi yig'iladi: ``co[i, j]`` — i va j birga bo'lgan savatlar
+soni (istaklar ``SHOP_RECOMMENDATIONS_WISHLIST_WEIGHT`` og'irlik bilan).
+O'xshashlik — kosinus: ``co[i, j] / sqrt(co[i, i] * co[j, j])``.
+Har bir mahsulot uchun eng yaxshi ``SHOP_RECOMMENDATIONS_TOP_K`` qo'shni
+``ProductRecommendation`` jadvaliga yoziladi.
+
+NumPy/SciPy o'rnatilgan bo'lsa matritsa ``scipy.sparse`` bilan
+(``X.T @ X``) hisoblanadi, aks holda ``Counter`` bo'yicha juftliklar
+sanaladi — natija bir xil. ``SHOP_RECOMMENDATIONS_MAX_BASKET`` dan katta
+savatlar (ulgurji buyurtmalar) kvadratik o'sish tufayli tashlab ketiladi.
+"""
+import heapq
+import math
+from collections import Counter, defaultdict
+from itertools import combinations
+
+from django.conf import settings
+from django.db import transaction
+
+from .cache import invalidate
+from .models import Product, ProductRecommendation, Order, OrderItem, UserProfile
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+
+def _setting(name, default):
+    return getattr(settings, f'SHOP_RECOMMENDATIONS_{name}', default)
+
+
+def _chunks(keys, items, key_field, chunk_size):
+    """``{savat: {mahsulot, ...}}`` bo'laklari; savatlar pk keyset bo'yicha."""
+    last_key = 0
+    while True:
+        key_ids = list(keys.filter(pk__gt=last_key).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not key_ids:
+            return
+        baskets = defaultdict(set)
+        rows = items.filter(**{f'{key_field}__gt': last_key, f'{key_field}__lte': key_ids[-1]})
+        for key, product_id in rows.values_list(key_field, 'product_id').iterator(chunk_size=2000):
+            baskets[key].add(product_id)
+        yield baskets
+        last_key = key_ids[-1]
+
+
+def basket_sources(chunk_size):
+    """``(og'irlik, savatlar bo'laklari)`` juftliklari."""
+    sources = [(1.0, _chunks(Order.objects.all(), OrderItem.objects.all(), 'order_id', chunk_size))]
+    wishlist_weight = _setting('WISHLIST_WEIGHT', 0.5)
+    if wishlist_weight:
+        sources.append((wishlist_weight, _chunks(
+            UserProfile.objects.all(), UserProfile.wishlist.through.objects.all(), 'userprofile_id', chunk_size
+        )))
+    return sources
+
+
+def _usable(baskets, max_basket):
+    # Bitta mahsulotli savat juftlik bermaydi, lekin mahsulot chastotasiga kiradi
+    return [products for products in baskets.values() if len(products) <= max_basket]
+
+
+class CounterSimilarity:
+    """Sof Python: juftliklar ``Counter`` da."""
+
+    def __init__(self):
+        self.pairs = Counter()
+        self.counts = Counter()
+
+    def add(self, baskets, weight):
+        for products in baskets:
+            for product_id in products:
+                self.counts[product_id] += weight
+            for pair in combinations(sorted(products), 2):
+                self.pairs[pair] += weight
+
+    def neighbours(self, top_k, min_support):
+        candidates = defaultdict(list)
+        for (a, b), together in self.pairs.items():
+            if together < min_support:
+                continue
+            score = together / math.sqrt(self.counts[a] * self.counts[b])
+            candidates[a].append((score, b))
+            candidates[b].append((score, a))
+        for product_id, scored in candidates.items():
+            yield product_id, heapq.nsmallest(top_k, scored, key=lambda item: (-item[0], item[1]))
+
+
+class SparseSimilarity:
+    """``scipy.sparse``: har bo'lak savat x mahsulot matritsasi, ``X.T @ X`` yig'indisi."""
+
+    def __init__(self, product_ids):
+        self.product_ids = np.asarray(product_ids)
+        self.index = {product_id: position for position, product_id in enumerate(product_ids)}
+        size = len(product_ids)
+        self.matrix = sparse.csr_matrix((size, size), dtype=np.float64)
+
+    def add(self, baskets, weight):
+        rows, cols = [], []
+        for row, products in enumerate(baskets):
+            for product_id in products:
+                if product_id in self.index:
+                    rows.append(row)
+                    cols.append(self.index[product_id])
+        if not rows:
+            return
+        incidence = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(len(baskets), len(self.product_ids))
+        )
+        self.matrix = self.matrix + (incidence.T @ incidence) * weight
+
+    def neighbours(self, top_k, min_support):
+        matrix = self.matrix.tocsr()
+        counts = matrix.diagonal()
+        matrix.setdiag(0)
+        matrix.eliminate_zeros()
+        for row in range(matrix.shape[0]):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            together = matrix.data[start:end]
+            cols = matrix.indices[start:end]
+            keep = together >= min_support
+            if not keep.any():
+                continue
+            cols = cols[keep]
+            scores = together[keep] / np.sqrt(counts[row] * counts[cols])
+            related = self.product_ids[cols]
+            order = np.lexsort((related, -scores))[:top_k]
+            yield int(self.product_ids[row]), [(float(scores[i]), int(related[i])) for i in order]
+
+
+def build_recommendations(top_k=None, chunk_size=None, min_support=None, use_sparse=None):
+    """O'xshashlik jadvalini qayta quradi; yozilgan qatorlar sonini qaytaradi."""
+    top_k = top_k or _setting('TOP_K', 10)
+    chunk_size = chunk_size or _setting('CHUNK_SIZE', 5000)
+    min_support = min_support if min_support is not None else _setting('MIN_SUPPORT', 2)
+    max_basket = _setting('MAX_BASKET', 50)
+    if use_sparse is None:
+        use_sparse = sparse is not None
+
+    if use_sparse:
+        similarity = SparseSimilarity(list(Product.objects.order_by('pk').values_list('pk', flat=True)))
+    else:
+        similarity = CounterSimilarity()
+    for weight, chunks in basket_sources(chunk_size):
+        for baskets in chunks:
+            similarity.add(_usable(baskets, max_basket), weight)
+
+    # Hisob tranzaksiyadan oldin: DELETE'dan keyin jadval qulfi faqat yozish davomida ushlanadi
+    rows = [
+        ProductRecommendation(product_id=product_id, related_id=related_id, rank=rank, score=score)
+        for product_id, scored in similarity.neighbours(top_k, min_support)
+        for rank, (score, related_id) in enumerate(scored)
+    ]
+    with transaction.atomic():
+        # O'qiyotganlar eski yoki yangi jadvalni to'liq ko'radi, yarimtasini emas
+        ProductRecommendation.objects.all().delete()
+        created = len(ProductRecommendation.objects.bulk_create(rows, batch_size=1000))
+    invalidate('recommendations')
+    return created
@@ -0,0 +1,285 @@
+"""Mahsulotlar bo'yicha to'liq matnli qidiruv.
+
+Uchta backend bir xil interfeysga ega:
+
+* ``SQLiteFTSBackend`` — SQLite FTS5 virtual jadvali, BM25 reytingi;
+* ``PostgresBackend`` — ``tsvector`` ustuni va GIN indeksi, ``ts_rank``;
+* ``TermIndexBackend`` — Python tokenizatori va oddiy B-tree indeksli
+  ``ProductSearchTerm`` jadvali (boshqa bazalar va zaxira uchun).
+
+Indeks mahsulot saqlanganda signals.py orqali yangilanadi va
+``manage.py rebuild_search_index`` bilan to'liq qayta quriladi.
+
+Natijalar ``SHOP_SEARCH_MAX_RESULTS`` bilan cheklanadi: ro'yxat va facet
+javoblarida ``search_truncated: true`` bo'lsa, qidiruv chegaraga yetgan va
+keyingi sahifalar (hamda facet sonlari) faqat shu natijalarni qamraydi.
+"""
+import re
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection as default_connection
+from django.db.models import Count, Sum
+
+FTS_TABLE = 'shop_product_fts'
+PG_TABLE = 'shop_product_search'
+
+# Maydon og'irliklari: nom > kategoriya > tavsif
+NAME_WEIGHT = 3.0
+CATEGORY_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+_APOSTROPHES = re.compile(r"[‘’ʻʼ'`]")
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize(text):
+    # O‘zbekcha "o‘", "g‘" kabi harflar so'zni ikkiga bo'lib yubormasligi uchun
+    return _APOSTROPHES.sub('', text or '').lower()
+
+
+def tokenize(text):
+    return [token[:64] for token in _TOKEN.findall(normalize(text))]
+
+
+def product_rows(queryset):
+    """Indekslash uchun ``(id, nom, tavsif, kategoriya nomi)`` qatorlari."""
+    return queryset.values_list('pk', 'name', 'description', 'category__name').iterator(chunk_size=2000)
+
+
+def _chunks(rows, size=500):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class SearchBackend:
+    def __init__(self, connection=None):
+        self.connection = connection or default_connection
+
+    def index(self, rows):
+        raise NotImplementedError
+
+    def remove(self, product_ids):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def search(self, query, limit):
+        """``[(product_id, score), ...]`` — reyting bo'yicha kamayish tartibida."""
+        raise NotImplementedError
+
+
+class TermIndexBackend(SearchBackend):
+    def __init__(self, connection=None, term_model=None):
+        super().__init__(connection)
+        if term_model is None:
+            from .models import ProductSearchTerm as term_model
+        self.model = term_model
+
+    def index(self, rows):
+        for chunk in _chunks(rows):
+            self.remove([row[0] for row in chunk])
+            terms = []
+            for product_id, name, description, category in chunk:
+                weights = defaultdict(float)
+                for text, weight in ((name, NAME_WEIGHT), (category, CATEGORY_WEIGHT),
+                                     (description, DESCRIPTION_WEIGHT)):
+                    for token in tokenize(text):
+                        weights[token] += weight
+                terms += [
+                    self.model(term=term, product_id=product_id, weight=weight)
+                    for term, weight in weights.items()
+                ]
+            self.model.objects.bulk_create(terms, batch_size=1000)
+
+    def remove(self, product_ids):
+        self.model.objects.filter(product_id__in=product_ids).delete()
+
+    def clear(self):
+        self.model.objects.all().delete()
+
+    def search(self, query, limit):
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        hits = (
+            self.model.objects.filter(term__in=terms)
+            .values('product_id')
+            .annotate(score=Sum('weight'), matched=Count('term'))
+            .filter(matched=len(terms))  # Barcha so'zlar mos kelishi shart
+            .order_by('-score', '-product_id')
+            .values_list('product_id', 'score')[:limit]
+        )
+        return list(hits)
+
+
+class SQLiteFTSBackend(SearchBackend):
+    @classmethod
+    def is_available(cls, connection):
+        if connection.vendor != 'sqlite':
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            return bool(cursor.fetchone()[0])
+
+    def create_table(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                f"USING fts5(name, description, category, tokenize='unicode61 remove_diacritics 2')"
+            )
+
+    def index(self, rows):
+        for chunk in _chunks(rows):
+            self.remove([row[0] for row in chunk])
+            with self.connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {FTS_TABLE} (rowid, name, description, category) VALUES (%s, %s, %s, %s)",
+                    [
+                        (product_id, normalize(name), normalize(description), normalize(category))
+                        for product_id, name, description, category in chunk
+                    ],
+                )
+
+    def remove(self, product_ids):
+        product_ids = list(product_ids)
+        if not product_ids:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(product_ids))})",
+                product_ids,
+            )
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+
+    def search(self, query, limit):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Har bir so'z qo'shtirnoqda — FTS5 sintaksisi foydalanuvchi matnidan himoyalangan
+        match = ' '.join(f'"{term}"' for term in terms)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, -bm25({FTS_TABLE}, %s, %s, %s) AS score FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s ORDER BY score DESC, rowid DESC LIMIT %s",
+                [NAME_WEIGHT, DESCRIPTION_WEIGHT, CATEGORY_WEIGHT, match, limit],
+            )
+            return cursor.fetchall()
+
+
+class PostgresBackend(SearchBackend):
+    _DOCUMENT = (
+        "setweight(to_tsvector('simple', %s), 'A') || "
+        "setweight(to_tsvector('simple', %s), 'B') || "
+        "setweight(to_tsvector('simple', %s), 'C')"
+    )
+
+    @classmethod
+    def is_available(cls, connection):
+        return connection.vendor == 'postgresql'
+
+    def create_table(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {PG_TABLE} ("
+                f"product_id bigint PRIMARY KEY REFERENCES shop_product (id) ON DELETE CASCADE, "
+                f"document tsvector NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {PG_TABLE}_document_idx ON {PG_TABLE} USING GIN (document)"
+            )
+
+    def index(self, rows):
+        for chunk in _chunks(rows):
+            with self.connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT INTO {PG_TABLE} (product_id, document) VALUES (%s, {self._DOCUMENT}) "
+                    f"ON CONFLICT (product_id) DO UPDATE SET document = excluded.document",
+                    [
+                        (product_id, normalize(name), normalize(category), normalize(description))
+                        for product_id, name, description, category in chunk
+                    ],
+                )
+
+    def remove(self, product_ids):
+        product_ids = list(product_ids)
+        if not product_ids:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {PG_TABLE} WHERE product_id = ANY(%s)", [product_ids])
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {PG_TABLE}")
+
+    def search(self, query, limit):
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT product_id, ts_rank(document, query) AS score "
+                f"FROM {PG_TABLE}, plainto_tsquery('simple', %s) query "
+                f"WHERE document @@ query ORDER BY score DESC, product_id DESC LIMIT %s",
+                [' '.join(terms), limit],
+            )
+            return cursor.fetchall()
+
+
+BACKENDS = {
+    'sqlite_fts': SQLiteFTSBackend,
+    'postgres': PostgresBackend,
+    'terms': TermIndexBackend,
+}
+
+
+def get_backend(connection=None, **kwargs):
+    """``SHOP_SEARCH_BACKEND`` sozlamasi yoki baza turiga qarab backend tanlaydi."""
+    connection = connection or default_connection
+    name = getattr(settings, 'SHOP_SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        if SQLiteFTSBackend.is_available(connection):
+            name = 'sqlite_fts'
+        elif PostgresBackend.is_available(connection):
+            name = 'postgres'
+        else:
+            name = 'terms'
+    backend_class = BACKENDS[name]
+    if backend_class is TermIndexBackend:
+        return backend_class(connection, **kwargs)
+    return backend_class(connection)
+
+
+def index_products(queryset):
+    get_backend().index(product_rows(queryset))
+
+
+def remove_products(product_ids):
+    get_backend().remove(product_ids)
+
+
+def rebuild_index(queryset):
+    backend = get_backend()
+    if hasattr(backend, 'create_table'):
+        backend.create_table()
+    backend.clear()
+    backend.index(product_rows(queryset))
+
+
+def search_limit():
+    return getattr(settings, 'SHOP_SEARCH_MAX_RESULTS', 500)
+
+
+def search_products(query):
+    """Eng yaxshi ``search_limit()`` ta natija — qolganlari tashlab yuboriladi."""
+    return get_backend().search(query, search_limit())
@@ -1,79 +1,133 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from .categories import subtree_product_counts
+from .dynamic_fields import DynamicFieldsMixin
+from .engagement import product_exists
+from .images import build_srcset
 from .models import (
-    Category, Product, ProductImage,
+    Category, CategoryClosure, Product, ProductImage,
     UserProfile, Comment, Like, Rating, CartItem,
     Order, OrderItem
 )
 
 # 1️⃣ Foydalanuvchi
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email']
 
 
 # 2️⃣ Kategoriya
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug']
 
 
+# Kategoriya view'lari uchun: daraxtdagi o'rni va quyi daraxtdagi mahsulotlar soni
+class CategoryTreeSerializer(CategorySerializer):
+    product_count = serializers.SerializerMethodField()
+
+    class Meta(CategorySerializer.Meta):
+        fields = CategorySerializer.Meta.fields + ['parent', 'depth', 'product_count']
+        read_only_fields = ['depth']
+        field_columns = {'product_count': []}
+
+    def get_product_count(self, obj):
+        # Ro'yxatdagi barcha kategoriyalar uchun bitta lug'at (context umumiy)
+        if 'category_counts' not in self.context:
+            self.context['category_counts'] = subtree_product_counts()
+        return self.context['category_counts'].get(obj.pk, 0)
+
+    def validate_parent(self, parent):
+        if parent is not None and self.instance is not None and CategoryClosure.objects.filter(
+            ancestor=self.instance, descendant=parent
+        ).exists():
+            raise serializers.ValidationError("Kategoriyani o'z avlodi ostiga ko'chirib bo'lmaydi")
+        return parent
+
+
 # 3️⃣ Mahsulot rasmi
-class ProductImageSerializer(serializers.ModelSerializer):
+class ProductImageSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = ProductImage
-        fields = ['id', 'product', 'image']
+        fields = ['id', 'product', 'image', 'srcset']
+        field_columns = {'srcset': ['variants']}
+
+    def get_srcset(self, obj):
+        return build_srcset(obj.variants, self.context.get('request'))
 
 
 
 # 4️⃣ Reytingni hisoblash uchun maxsus maydon
 class ProductRatingSerializer(serializers.ModelSerializer):
-    average_rating = serializers.SerializerMethodField()
+    average_rating = serializers.FloatField(read_only=True)
 
     class Meta:
         model = Product
         fields = ['id', 'average_rating']
 
-    def get_average_rating(self, obj):
-        ratings = obj.ratings.all()
-        if ratings.exists():
-            return round(sum([r.stars for r in ratings]) / ratings.count(), 2)
-        return 0
-
 
 # 5️⃣ Mahsulot
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     images = ProductImageSerializer(many=True, read_only=True)
     category = CategorySerializer(read_only=True)
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
-    average_rating = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
+    main_image_srcset = serializers.SerializerMethodField()
+    thumbnail = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
         fields = [
-            'id', 'name', 'description', 'price', 'main_image',
+            'id', 'name', 'slug', 'description', 'price', 'main_image', 'main_image_srcset', 'thumbnail',
             'category', 'images', 'likes_count', 'comments_count', 'average_rating',
         ]
-
-    def get_likes_count(self, obj):
-        return obj.likes.count()
-
-    def get_comments_count(self, obj):
-        return obj.comments.count()
-
-    def get_average_rating(self, obj):
-        ratings = obj.ratings.all()
-        if ratings.exists():
-            return round(sum([r.stars for r in ratings]) / ratings.count(), 2)
-        return 0
+        expandable_fields = ['category', 'images']
+        # Model maydoni bo'lmagan maydonlar qaysi ustunlarni o'qiydi (optimize_queryset uchun)
+        field_columns = {
+            'main_image_srcset': ['main_image_variants'],
+            'thumbnail': ['main_image', 'main_image_variants'],
+            'average_rating': ['rating_sum', 'rating_count'],
+        }
+
+    def get_main_image_srcset(self, obj):
+        return build_srcset(obj.main_image_variants, self.context.get('request'))
+
+    def get_thumbnail(self, obj):
+        # Ro'yxat kartochkalari uchun eng kichik nusxa, bo'lmasa asl rasm
+        request = self.context.get('request')
+        thumb = build_srcset(obj.main_image_variants, request).get('thumb')
+        if thumb:
+            return thumb['jpeg']
+        if not obj.main_image:
+            return None
+        return request.build_absolute_uri(obj.main_image.url) if request else obj.main_image.url
+
+
+# Mahsulot id'si keshdan tekshiriladi; qaytariladigan obyektda faqat pk yuklangan
+class CachedProductField(serializers.PrimaryKeyRelatedField):
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Product.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if isinstance(data, bool) or not product_exists(pk):
+            self.fail('does_not_exist', pk_value=data)
+        return Product.from_db('default', ['id'], [pk])
 
 
 # 6️⃣ Izoh
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
+    product = CachedProductField()
 
     class Meta:
         model = Comment
@@ -83,6 +137,7 @@ class CommentSerializer(serializers.ModelSerializer):
 # 7️⃣ Layk
 class LikeSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
+    product = CachedProductField()
 
     class Meta:
         model = Like
@@ -92,20 +147,23 @@ class LikeSerializer(serializers.ModelSerializer):
 # 8️⃣ Reyting
 class RatingSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
+    product = CachedProductField()
 
     class Meta:
         model = Rating
         fields = ['id', 'user', 'product', 'stars', 'created_at']
+        extra_kwargs = {'stars': {'min_value': 1, 'max_value': 5}}
 
 
 # 9️⃣ Foydalanuvchi profili
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     wishlist = ProductSerializer(many=True, read_only=True)
     user = UserSerializer(read_only=True)
 
     class Meta:
         model = UserProfile
         fields = ['id', 'user', 'wishlist']
+        expandable_fields = ['user', 'wishlist']
 
 
 # 🔟 Foydalanuvchi uchun Register Serializer
@@ -132,24 +190,74 @@ class LoginSerializer(serializers.Serializer):
 
 
 # 1️⃣2️⃣ Foydalanuvchi uchun savat
-class CartItemSerializer(serializers.ModelSerializer):
+class CartItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     product_detail = ProductSerializer(source='product', read_only=True)
 
     class Meta:
         model = CartItem
         fields = ['id', 'product', 'product_detail', 'quantity']
-        
+        expandable_fields = ['product_detail']
+
+
+class CartLineSerializer(serializers.Serializer):
+    product = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
+class CartBatchLineSerializer(serializers.Serializer):
+    product = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=0)  # 'set' rejimida 0 — o'chirish
+
+
+class CartBatchSerializer(serializers.Serializer):
+    MODE_ADD = 'add'
+    MODE_SET = 'set'
+
+    mode = serializers.ChoiceField(choices=[MODE_ADD, MODE_SET], default=MODE_ADD)
+    items = CartBatchLineSerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs):
+        if attrs['mode'] == self.MODE_ADD and any(line['quantity'] == 0 for line in attrs['items']):
+            raise serializers.ValidationError({'items': "'add' rejimida miqdor kamida 1 bo‘lishi kerak"})
+        return attrs
+
+
+# Istaklar ro'yxatiga bir yoki bir nechta mahsulot
+class WishlistUpdateSerializer(serializers.Serializer):
+    MAX_ITEMS = 200
+
+    product_id = serializers.IntegerField(min_value=1, required=False)
+    product_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=MAX_ITEMS
+    )
+
+    def validate(self, attrs):
+        ids = list(attrs.get('product_ids', []))
+        if 'product_id' in attrs:
+            ids.append(attrs['product_id'])
+        if not ids:
+            raise serializers.ValidationError("'product_id' yoki 'product_ids' kerak")
+        return {'product_ids': ids}
+
 # 1️⃣3️⃣ Buyurtmalar
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source='product.name', read_only=True)
 
     class Meta:
         model = OrderItem
-        fields = ['product', 'product_name', 'quantity']
+        fields = ['product', 'product_name', 'quantity', 'unit_price', 'line_total']
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, read_only=True)
 
     class Meta:
         model = Order
-        fields = ['id', 'created_at', 'is_paid', 'items']
\ No newline at end of file
+        fields = ['id', 'created_at', 'is_paid', 'total_amount', 'item_count', 'items']
+        expandable_fields = ['items']
+
+
+# Buyurtmalar tarixi — elementlarsiz, faqat denormallashtirilgan summalar
+class OrderSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Order
+        fields = ['id', 'created_at', 'is_paid', 'total_amount', 'item_count']
\ No newline at end of file
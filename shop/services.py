@@ -0,0 +1,151 @@
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, F, Q, When
+
+from .models import Product, CartItem, Order, OrderItem
+
+
+class CheckoutError(Exception):
+    pass
+
+
+class EmptyCart(CheckoutError):
+    pass
+
+
+class OutOfStock(CheckoutError):
+    def __init__(self, product_ids):
+        super().__init__(f"Omborda yetarli emas: {product_ids}")
+        self.product_ids = product_ids
+
+
+class UnknownProducts(Exception):
+    def __init__(self, product_ids):
+        super().__init__(f"Mahsulot topilmadi: {product_ids}")
+        self.product_ids = product_ids
+
+
+def checkout(user):
+    """Foydalanuvchi savatchasidan buyurtma yaratadi.
+
+    Hammasi bitta tranzaksiyada va o'zgarmas sondagi so'rovlarda bajariladi:
+    mahsulot qatorlari id tartibida ``select_for_update`` bilan qulflanadi
+    (deadlock bo'lmasligi uchun), qoldiq shartli ``F()`` UPDATE bilan
+    kamaytiriladi, narx va summalar OrderItem/Order'ga yozib qo'yiladi va
+    savatcha tozalanadi.
+    """
+    with transaction.atomic():
+        lines = list(
+            CartItem.objects.filter(user=user)
+            .order_by('product_id')
+            .values_list('product_id', 'quantity')
+        )
+        if not lines:
+            raise EmptyCart()
+        product_ids = [product_id for product_id, _ in lines]
+
+        prices = dict(
+            Product.objects.select_for_update()
+            .filter(pk__in=product_ids)
+            .order_by('pk')
+            .values_list('pk', 'price')
+        )
+
+        in_stock = Q()
+        new_stock = []
+        for product_id, quantity in lines:
+            in_stock |= Q(pk=product_id, stock__gte=quantity)
+            new_stock.append(When(pk=product_id, then=F('stock') - quantity))
+        updated = Product.objects.filter(in_stock).update(stock=Case(*new_stock))
+        if updated != len(lines):
+            stock = dict(Product.objects.filter(pk__in=product_ids).values_list('pk', 'stock'))
+            raise OutOfStock([
+                product_id for product_id, quantity in lines
+                if stock.get(product_id, 0) < quantity
+            ])
+
+        items = [
+            OrderItem(
+                product_id=product_id,
+                quantity=quantity,
+                unit_price=prices[product_id],
+                line_total=prices[product_id] * quantity,
+            )
+            for product_id, quantity in lines
+        ]
+        # Buyurtmalar tarixi elementlarni o'qimasdan jami summani ko'rsatadi
+        order = Order.objects.create(
+            user=user,
+            total_amount=sum(item.line_total for item in items),
+            item_count=sum(quantity for _, quantity in lines),
+        )
+        for item in items:
+            item.order = order
+        OrderItem.objects.bulk_create(items)
+        CartItem.objects.filter(user=user).delete()
+    return order
+
+
+def _upsert_cart_sql(user_id, lines, increment):
+    # INSERT ... ON CONFLICT DO UPDATE (SQLite >= 3.24, PostgreSQL)
+    qn = connection.ops.quote_name
+    table = qn(CartItem._meta.db_table)
+    quantity = qn('quantity')
+    if increment:
+        new_quantity = f"{table}.{quantity} + excluded.{quantity}"
+    else:
+        new_quantity = f"excluded.{quantity}"
+    sql = (
+        f"INSERT INTO {table} ({qn('user_id')}, {qn('product_id')}, {quantity}) "
+        f"VALUES {', '.join(['(%s, %s, %s)'] * len(lines))} "
+        f"ON CONFLICT ({qn('user_id')}, {qn('product_id')}) "
+        f"DO UPDATE SET {quantity} = {new_quantity}"
+    )
+    params = [value for product_id, qty in lines.items() for value in (user_id, product_id, qty)]
+    with connection.cursor() as cursor:
+        if connection.features.can_return_rows_from_bulk_insert:
+            cursor.execute(f"{sql} RETURNING {qn('product_id')}, {qn('id')}", params)
+            return dict(cursor.fetchall())
+        cursor.execute(sql, params)
+    return dict(
+        CartItem.objects.filter(user_id=user_id, product_id__in=lines).values_list('product_id', 'id')
+    )
+
+
+def _upsert_cart_orm(user_id, lines, increment):
+    # ON CONFLICT qo'llab-quvvatlanmaydigan bazalar uchun F() bilan zaxira yo'l
+    with transaction.atomic():
+        _upsert_cart_lines_orm(user_id, lines, increment)
+    return dict(
+        CartItem.objects.filter(user_id=user_id, product_id__in=lines).values_list('product_id', 'id')
+    )
+
+
+def _upsert_cart_lines_orm(user_id, lines, increment):
+    for product_id, qty in lines.items():
+        new_quantity = F('quantity') + qty if increment else qty
+        items = CartItem.objects.filter(user_id=user_id, product_id=product_id)
+        if not items.update(quantity=new_quantity):
+            try:
+                with transaction.atomic():
+                    CartItem.objects.create(user_id=user_id, product_id=product_id, quantity=qty)
+            except IntegrityError:
+                # Parallel so'rov qatorni biz bilan bir vaqtda yaratdi
+                items.update(quantity=new_quantity)
+
+
+def upsert_cart(user, lines, increment=True):
+    """Savatcha qatorlarini bitta atomar upsert bilan yozadi.
+
+    ``lines`` — ``{product_id: quantity}``. ``increment=True`` bo'lsa miqdor
+    mavjud qiymatga qo'shiladi, aks holda almashtiriladi. ``{product_id: item_id}``
+    qaytaradi.
+    """
+    if not lines:
+        return {}
+    existing = set(Product.objects.filter(pk__in=lines).values_list('pk', flat=True))
+    missing = sorted(set(lines) - existing)
+    if missing:
+        raise UnknownProducts(missing)
+    if connection.vendor in ('sqlite', 'postgresql'):
+        return _upsert_cart_sql(user.pk, lines, increment)
+    return _upsert_cart_orm(user.pk, lines, increment)
@@ -1,9 +1,157 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
 from django.dispatch import receiver
-from .models import UserProfile
+from .models import Category, Product, ProductImage, ProductPopularity, UserProfile, Like, Comment, Rating
+from .counters import adjust_counters, refresh_counters
+from .cache import invalidate
+from .search import index_products, remove_products
+from .images import schedule_variants
+from .slugs import slug_cache
+from .authentication import forget_token, forget_user_tokens
+from .engagement import forget_product
+from .wishlist import forget_wishlist
 
 @receiver(post_save, sender=User)
 def create_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.create(user=instance)
+
+
+# Mahsulot hisoblagichlari
+@receiver(post_save, sender=Like)
+def like_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_counters(instance.product_id, likes_count=1)
+
+
+@receiver(post_delete, sender=Like)
+def like_deleted(sender, instance, **kwargs):
+    adjust_counters(instance.product_id, likes_count=-1)
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_counters(instance.product_id, comments_count=1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    adjust_counters(instance.product_id, comments_count=-1)
+
+
+@receiver(post_save, sender=Rating)
+def rating_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_counters(instance.product_id, rating_sum=instance.stars, rating_count=1)
+    else:
+        # Yulduzlar o'zgargan bo'lishi mumkin — eski qiymat noma'lum
+        refresh_counters([instance.product_id])
+
+
+@receiver(post_delete, sender=Rating)
+def rating_deleted(sender, instance, **kwargs):
+    adjust_counters(instance.product_id, rating_sum=-instance.stars, rating_count=-1)
+
+
+# Katalog keshini aniq invalidatsiya qilish
+# 'catalog' — faqat mahsulot/kategoriya qatorlari (rasm, layk, ommaboplik emas)
+@receiver([post_save, post_delete], sender=Category)
+def category_changed(sender, instance, **kwargs):
+    invalidate('categories', 'catalog', f'category:{instance.pk}')
+
+
+@receiver([post_save, post_delete], sender=Product)
+def product_changed(sender, instance, **kwargs):
+    invalidate('products', 'catalog', f'product:{instance.pk}')
+
+
+@receiver(post_save, sender=Product)
+def product_created_popularity(sender, instance, created, **kwargs):
+    # ordering=popular faqat ommaboplik qatori bor mahsulotlarni ko'rsatadi
+    if created:
+        ProductPopularity.objects.create(product=instance)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    forget_product(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ProductImage)
+def product_image_changed(sender, instance, **kwargs):
+    invalidate('products', f'product:{instance.product_id}')
+
+
+# Layk/izoh/reyting faqat o'z mahsulotini tozalaydi: ro'yxatlardagi hisoblagichlar
+# SHOP_RESPONSE_CACHE_TIMEOUT davomida eskirgan bo'lishi mumkin
+@receiver([post_save, post_delete], sender=Like)
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=Rating)
+def product_engagement_changed(sender, instance, **kwargs):
+    invalidate(f'product:{instance.product_id}')
+
+
+# Qidiruv indeksini yangilash
+@receiver(post_save, sender=Product)
+def product_saved_index(sender, instance, **kwargs):
+    index_products(Product.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted_index(sender, instance, **kwargs):
+    remove_products([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def category_saved_index(sender, instance, created, **kwargs):
+    if not created:
+        index_products(instance.products.all())
+
+
+# Rasm nusxalari (thumbnail, WebP/JPEG)
+@receiver(post_save, sender=Product)
+def product_main_image_variants(sender, instance, **kwargs):
+    schedule_variants(instance, 'main_image', 'main_image_variants')
+
+
+@receiver(post_save, sender=ProductImage)
+def product_image_variants(sender, instance, **kwargs):
+    schedule_variants(instance, 'image', 'variants')
+
+
+# slug -> id keshini tozalash
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Product)
+def evict_slug(sender, instance, **kwargs):
+    slug_cache.evict(instance)
+
+
+# Token keshi
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    forget_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, **kwargs):
+    if not created:
+        forget_user_tokens(instance.pk)
+
+
+# Istaklar id keshi (wishlist.add/remove/clear; partiyaviy yo'l keshni o'zi tozalaydi)
+@receiver(m2m_changed, sender=UserProfile.wishlist.through)
+def wishlist_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            forget_wishlist(instance.user_id)
+        return
+    # product.wishlisted_by tomoni: pk_set — profil id'lari
+    if action in ('post_add', 'post_remove'):
+        profiles = UserProfile.objects.filter(pk__in=pk_set)
+    elif action == 'pre_clear':
+        profiles = instance.wishlisted_by.all()
+    else:
+        return
+    forget_wishlist(*profiles.values_list('user_id', flat=True))
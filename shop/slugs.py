@@ -0,0 +1,80 @@
+import re
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.text import slugify
+
+# urls.py'da ``<slug:slug>`` dan oldin turgan yo'llar — bunday slug'li sahifa ochilmaydi
+RESERVED_SLUGS = frozenset({'facets'})
+
+
+def unique_slug(instance, value, fallback):
+    """``value`` dan modelda band bo'lmagan slug yasaydi: ``nom``, ``nom-2``, ``nom-3``...
+
+    Bitta so'rov bilan faqat ``nom`` va ``nom-<raqam>`` sluglarini oladi.
+    """
+    max_length = instance._meta.get_field('slug').max_length
+    base = (slugify(value) or fallback)[:max_length - 6].strip('-') or fallback
+    taken = set(
+        type(instance)._default_manager.filter(
+            Q(slug=base) | Q(slug__startswith=f'{base}-', slug__regex=rf'^{re.escape(base)}-[0-9]+$')
+        )
+        .exclude(pk=instance.pk)
+        .values_list('slug', flat=True)
+    )
+    if base in RESERVED_SLUGS:
+        taken.add(base)
+    if base not in taken:
+        return base
+    suffix = 2
+    while f'{base}-{suffix}' in taken:
+        suffix += 1
+    return f'{base}-{suffix}'
+
+
+class SlugCache:
+    """Jarayon ichidagi chegaralangan LRU kesh: (model, slug) -> pk.
+
+    Yo'q sluglar keshlanmaydi; signals.py saqlash/o'chirishda yozuvni olib tashlaydi.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._slugs = {}
+        self._lock = Lock()
+
+    def resolve(self, model, slug):
+        key = (model._meta.label, slug)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        pk = model._default_manager.filter(slug=slug).values_list('pk', flat=True).first()
+        if pk is not None:
+            with self._lock:
+                self._entries[key] = pk
+                self._slugs[(key[0], pk)] = slug
+                while len(self._entries) > self.maxsize:
+                    (label, _), old_pk = self._entries.popitem(last=False)
+                    self._slugs.pop((label, old_pk), None)
+        return pk
+
+    def evict(self, instance):
+        label = instance._meta.label
+        with self._lock:
+            for slug in (self._slugs.pop((label, instance.pk), None), instance.slug):
+                self._entries.pop((label, slug), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._slugs.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+slug_cache = SlugCache(getattr(settings, 'SHOP_SLUG_CACHE_SIZE', 10000))
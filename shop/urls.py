@@ -1,11 +1,15 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
-    ProductListView, ProductDetailView, ProductImageUploadView,
+    ProductListView, ProductDetailView, ProductFacetsView, ProductRelatedView, ProductImageUploadView,
     CategoryListView, CategoryDetailView,
     CommentCreateView, LikeCreateView, RatingCreateView,
-    UserProfileView, WishlistView, AdminProductCreateView,
-    RegisterView, LoginView, LogoutView, CartView, OrderAPIView
+    UserProfileView, WishlistView, WishlistMembershipView, AdminProductCreateView,
+    RegisterView, LoginView, LogoutView, CartView, CartBatchView, OrderAPIView, OrderHistoryView
+)
+from .async_views import (
+    AsyncCategoryListView, AsyncCategoryDetailView, AsyncProductListView,
+    AsyncProductDetailView, AsyncWishlistView, AsyncOrderListView
 )
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
@@ -29,10 +33,14 @@ urlpatterns = [
     # Kategoriya URL'lari
     path('categories/', CategoryListView.as_view(), name='category-list'),
     path('categories/<int:pk>/', CategoryDetailView.as_view(), name='category-detail'),
+    path('categories/<slug:slug>/', CategoryDetailView.as_view(), name='category-detail-slug'),
     
     # Mahsulot URL'lari
     path('products/', ProductListView.as_view(), name='product-list'),
+    path('products/facets/', ProductFacetsView.as_view(), name='product-facets'),
     path('products/<int:pk>/', ProductDetailView.as_view(), name='product-detail'),
+    path('products/<int:pk>/related/', ProductRelatedView.as_view(), name='product-related'),
+    path('products/<slug:slug>/', ProductDetailView.as_view(), name='product-detail-slug'),
     path('product-images/', ProductImageUploadView.as_view(), name='product-image-upload'),
 
     
@@ -50,6 +58,7 @@ urlpatterns = [
     
     # Wishlist URL'lari
     path('wishlist/', WishlistView.as_view(), name='wishlist'),
+    path('wishlist/membership/', WishlistMembershipView.as_view(), name='wishlist-membership'),
     
     # Admin mahsulot qo'shish URL'i
     path('admin/products/', AdminProductCreateView.as_view(), name='admin-product-create'),
@@ -63,5 +72,15 @@ urlpatterns = [
     path('swagger/', schema_view.as_view(), name='swagger'),  # Swagger URL qo'shish
     # Savatcha
     path('cart/', CartView.as_view(), name='cart'),
+    path('cart/batch/', CartBatchView.as_view(), name='cart-batch'),
     path('orders/', OrderAPIView.as_view(), name='orders'),
+    path('orders/history/', OrderHistoryView.as_view(), name='order-history'),
+
+    # Async (ASGI) o'qish endpoint'lari
+    path('async/categories/', AsyncCategoryListView.as_view(), name='async-category-list'),
+    path('async/categories/<int:pk>/', AsyncCategoryDetailView.as_view(), name='async-category-detail'),
+    path('async/products/', AsyncProductListView.as_view(), name='async-product-list'),
+    path('async/products/<int:pk>/', AsyncProductDetailView.as_view(), name='async-product-detail'),
+    path('async/wishlist/', AsyncWishlistView.as_view(), name='async-wishlist'),
+    path('async/orders/', AsyncOrderListView.as_view(), name='async-orders'),
 ]
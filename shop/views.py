@@ -2,42 +2,118 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from .models import  (Category, Product, ProductImage, UserProfile, 
-    Comment, Like, Rating, CartItem, Order, OrderItem)
+    Comment, Like, Rating, CartItem, Order)
 from .serializers import (
-    CategorySerializer, ProductSerializer, ProductImageSerializer,
+    CategoryTreeSerializer, ProductSerializer, ProductImageSerializer,
     UserProfileSerializer, CommentSerializer, LikeSerializer, RatingSerializer,
     RegisterSerializer, LoginSerializer, CartItemSerializer,
-    OrderSerializer
+    CartLineSerializer, CartBatchSerializer, OrderSerializer, OrderSummarySerializer,
+    WishlistUpdateSerializer
 )
+from core.db_router import ReplicaReadMixin
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import ProtectedError
+from django.http import Http404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.models import Token
 from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.throttling import ScopedRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
-from .filters import ProductFilter
+from .filters import CategoryFilter, ProductFilter
+from .pagination import CreatedAtCursorPagination
+from .cache import CachedResponseMixin
+from .profiling import ProfilingMixin
+from .slugs import slug_cache
+from .facets import compute_facets
+from .authentication import issue_signed_token
+from .engagement import engagement_buffer, product_exists
+from .wishlist import (
+    add_to_wishlist, remove_from_wishlist, membership, wishlist_ids, UnknownWishlistProducts
+)
+from .services import checkout, upsert_cart, EmptyCart, OutOfStock, UnknownProducts
+
+# URL'dagi slug'ni keshdan pk'ga aylantiradi — qolgan kod faqat pk bilan ishlaydi
+class SlugLookupMixin:
+    def initial(self, request, *args, **kwargs):
+        if 'slug' in self.kwargs:
+            pk = slug_cache.resolve(self.queryset.model, self.kwargs.pop('slug'))
+            if pk is None:
+                raise Http404
+            self.kwargs['pk'] = pk
+        super().initial(request, *args, **kwargs)
+
 
 # 1️⃣ Kategoriya API (List va Detail)
-class CategoryListView(generics.ListCreateAPIView):
+class CategoryListView(ProfilingMixin, ReplicaReadMixin, CachedResponseMixin, generics.ListCreateAPIView):
+    # product_count mahsulotlarga ham bog'liq; 'catalog' kategoriya yozuvlarida ham oshadi
+    cache_namespaces = ('catalog',)
     queryset = Category.objects.all()
-    serializer_class = CategorySerializer
+    serializer_class = CategoryTreeSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = CategoryFilter
 
 
-class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CategoryDetailView(ProfilingMixin, ReplicaReadMixin, SlugLookupMixin, CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+    cache_namespaces = ('catalog',)
+    cache_object_namespace = 'category'
     queryset = Category.objects.all()
-    serializer_class = CategorySerializer
+    serializer_class = CategoryTreeSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    def destroy(self, request, *args, **kwargs):
+        try:
+            return super().destroy(request, *args, **kwargs)
+        except ProtectedError:
+            return Response({'error': "Avval ichki kategoriyalarni o'chiring yoki ko'chiring"}, status=409)
+
 
 # 2️⃣ Mahsulot API (List, Detail)
-class ProductListView(generics.ListCreateAPIView):
+class ProductListView(ProfilingMixin, ReplicaReadMixin, CachedResponseMixin, generics.ListCreateAPIView):
+    cache_namespaces = ('products', 'categories')
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_class = ProductFilter
 
+    def get_queryset(self):
+        # ?fields=/?expand= bo'yicha faqat kerakli ustun va bog'lanishlar
+        return self.get_serializer().optimize_queryset(super().get_queryset())
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if hasattr(request, 'search_truncated'):
+            response.data['search_truncated'] = request.search_truncated
+        return response
+
+    def get_pagination_ordering(self):
+        params = self.request.query_params
+        if params.get('ordering') == 'popular':
+            return ('-popularity_score', '-id')
+        if params.get('q') or params.get('name'):
+            return ('-search_rank', '-id')
+        return None
+
+
+# Yon panel uchun facet'lar (ProductFilter bilan bir xil filtrlar)
+class ProductFacetsView(ProfilingMixin, ReplicaReadMixin, CachedResponseMixin, generics.ListAPIView):
+    # Reyting bo'laklari layk/reytingda emas, TTL bilan yangilanadi
+    cache_namespaces = ('catalog',)
+    queryset = Product.objects.all()
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = ProductFilter
+    pagination_class = None
+
+    def list(self, request, *args, **kwargs):
+        data = compute_facets(self.filter_queryset(self.get_queryset()))
+        if hasattr(request, 'search_truncated'):
+            data['search_truncated'] = request.search_truncated
+        return Response(data)
 
 
 class ProductImageUploadView(generics.CreateAPIView):
@@ -47,75 +123,156 @@ class ProductImageUploadView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class ProductDetailView(generics.RetrieveAPIView):
+class ProductDetailView(ProfilingMixin, ReplicaReadMixin, SlugLookupMixin, CachedResponseMixin, generics.RetrieveAPIView):
+    cache_namespaces = ('categories',)
+    cache_object_namespace = 'product'
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    def get_queryset(self):
+        return self.get_serializer().optimize_queryset(super().get_queryset())
+
+
+# "Bu bilan birga olishadi" — build_recommendations tayyorlagan top-K (product, rank) indeksidan
+class ProductRelatedView(ProfilingMixin, ReplicaReadMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_namespaces = ('products', 'recommendations')
+    cache_object_namespace = 'product'
+    serializer_class = ProductSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = None
+
+    def get_queryset(self):
+        if not product_exists(self.kwargs['pk']):
+            raise Http404
+        products = Product.objects.filter(recommended_for__product_id=self.kwargs['pk']).order_by(
+            'recommended_for__rank'
+        )
+        return self.get_serializer().optimize_queryset(products)
+
 
 # 3️⃣ Izoh API (Create va List)
-class CommentCreateView(generics.CreateAPIView):
-    queryset = Comment.objects.all()
+# Layk/izoh/reyting yozuvlari uchun foydalanuvchi bo'yicha cheklov (o'qish cheklanmaydi)
+class EngagementThrottleMixin:
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'engagement'
+
+    def get_throttles(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return []
+        return super().get_throttles()
+
+
+class CommentCreateView(ProfilingMixin, EngagementThrottleMixin, generics.ListCreateAPIView):
+    queryset = Comment.objects.select_related('user')
     serializer_class = CommentSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        product_id = self.request.query_params.get('product')
+        if product_id:
+            queryset = queryset.filter(product_id=product_id)
+        return queryset
 
     def perform_create(self, serializer):
-        product = Product.objects.get(id=self.request.data['product'])
-        serializer.save(user=self.request.user, product=product)
+        serializer.save(user=self.request.user)
 
 
 # 4️⃣ Layk API (Create va List)
-class LikeCreateView(generics.CreateAPIView):
+class LikeCreateView(ProfilingMixin, EngagementThrottleMixin, generics.CreateAPIView):
     queryset = Like.objects.all()
     serializer_class = LikeSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def perform_create(self, serializer):
-        product = Product.objects.get(id=self.request.data['product'])
-        serializer.save(user=self.request.user, product=product)
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        product = serializer.validated_data['product']
+        if settings.SHOP_ENGAGEMENT_BUFFER:
+            engagement_buffer.add_like(request.user.pk, product.pk)
+            return Response({'status': 'queued'}, status=status.HTTP_202_ACCEPTED)
+        # Takroriy layk xato emas — mavjud yozuv qaytariladi
+        like, created = Like.objects.get_or_create(user=request.user, product=product)
+        return Response(self.get_serializer(like).data,
+                        status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
 
 # 5️⃣ Reyting API (Create va List)
-class RatingCreateView(generics.CreateAPIView):
+class RatingCreateView(ProfilingMixin, EngagementThrottleMixin, generics.CreateAPIView):
     queryset = Rating.objects.all()
     serializer_class = RatingSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def perform_create(self, serializer):
-        product = Product.objects.get(id=self.request.data['product'])
-        serializer.save(user=self.request.user, product=product)
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        product, stars = serializer.validated_data['product'], serializer.validated_data['stars']
+        if settings.SHOP_ENGAGEMENT_BUFFER:
+            engagement_buffer.add_rating(request.user.pk, product.pk, stars)
+            return Response({'status': 'queued'}, status=status.HTTP_202_ACCEPTED)
+        # Qayta baholash oldingi bahoni almashtiradi
+        rating, created = Rating.objects.update_or_create(
+            user=request.user, product=product, defaults={'stars': stars}
+        )
+        return Response(self.get_serializer(rating).data,
+                        status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
 
 # 6️⃣ Foydalanuvchi profili (GET va Update)
-class UserProfileView(generics.RetrieveUpdateAPIView):
+class UserProfileView(ProfilingMixin, generics.RetrieveUpdateAPIView):
     queryset = UserProfile.objects.all()
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user.profile
+        return self.get_serializer().optimize_queryset(self.get_queryset()).get(user=self.request.user)
 
 
 # 7️⃣ Wishlist API (Add va Remove mahsulotlar)
-class WishlistView(APIView):
+class WishlistView(ProfilingMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        profile = request.user.profile
-        serializer = ProductSerializer(profile.wishlist.all(), many=True)
-        return Response(serializer.data)
+        context = {'request': request}
+        products = ProductSerializer(context=context).optimize_queryset(
+            Product.objects.filter(wishlisted_by__user=request.user)
+        )
+        return Response(self.profile_serializer(ProductSerializer(products, many=True, context=context)).data)
 
     def post(self, request):
-        product = Product.objects.get(id=request.data['product_id'])
-        request.user.profile.wishlist.add(product)
-        return Response({'status': 'added to wishlist'}, status=201)
+        serializer = self.profile_serializer(WishlistUpdateSerializer(data=request.data))
+        serializer.is_valid(raise_exception=True)
+        try:
+            product_ids = add_to_wishlist(request.user, serializer.validated_data['product_ids'])
+        except UnknownWishlistProducts as exc:
+            return Response({'error': 'Mahsulot topilmadi', 'product_ids': exc.product_ids}, status=400)
+        return Response({'status': 'added to wishlist', 'product_ids': product_ids}, status=201)
 
     def delete(self, request):
-        product = Product.objects.get(id=request.data['product_id'])
-        request.user.profile.wishlist.remove(product)
+        serializer = self.profile_serializer(WishlistUpdateSerializer(data=request.data))
+        serializer.is_valid(raise_exception=True)
+        remove_from_wishlist(request.user, serializer.validated_data['product_ids'])
         return Response({'status': 'removed from wishlist'}, status=204)
 
 
+# Mahsulot kartochkalari uchun: ?ids=1,2,3 -> qaysilari istaklarda
+class WishlistMembershipView(ProfilingMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        raw = request.query_params.get('ids')
+        if raw is None:
+            return Response({'ids': sorted(wishlist_ids(request.user.pk))})
+        try:
+            product_ids = [int(value) for value in raw.split(',') if value.strip()]
+        except ValueError:
+            return Response({'error': "ids vergul bilan ajratilgan butun sonlar bo'lishi kerak"}, status=400)
+        if len(product_ids) > WishlistUpdateSerializer.MAX_ITEMS:
+            return Response({'error': f'Ko‘pi bilan {WishlistUpdateSerializer.MAX_ITEMS} ta id'}, status=400)
+        return Response(membership(request.user.pk, product_ids))
+
+
 # 8️⃣ Admin mahsulot qo‘shish uchun faqat admin
 class AdminProductCreateView(generics.CreateAPIView):
     queryset = Product.objects.all()
@@ -143,10 +300,13 @@ class LoginView(APIView):
             user = User.objects.filter(username=serializer.validated_data['username']).first()
             if user and user.check_password(serializer.validated_data['password']):
                 token, created = Token.objects.get_or_create(user=user)
-                return Response({
+                data = {
                     'user': RegisterSerializer(user).data,
                     'token': token.key
-                }, status=status.HTTP_200_OK)
+                }
+                if settings.SHOP_SIGNED_TOKENS:
+                    data['signed_token'] = issue_signed_token(user)
+                return Response(data, status=status.HTTP_200_OK)
             return Response({'detail': 'Invalid credentials'}, status=status.HTTP_400_BAD_REQUEST)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
@@ -164,26 +324,24 @@ class LogoutView(APIView):
         
         
 # 🔟 Foydalanuvchi uchun shopping savatchasi
-class CartView(APIView):
+class CartView(ProfilingMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        items = CartItem.objects.filter(user=request.user)
-        serializer = CartItemSerializer(items, many=True)
-        return Response(serializer.data)
+        context = {'request': request}
+        items = CartItemSerializer(context=context).optimize_queryset(CartItem.objects.filter(user=request.user))
+        return Response(self.profile_serializer(CartItemSerializer(items, many=True, context=context)).data)
 
     def post(self, request):
-        product_id = request.data.get('product')
-        quantity = request.data.get('quantity', 1)
+        serializer = self.profile_serializer(CartLineSerializer(data=request.data))
+        serializer.is_valid(raise_exception=True)
+        product_id = serializer.validated_data['product']
 
-        product = Product.objects.get(id=product_id)
-        item, created = CartItem.objects.get_or_create(user=request.user, product=product)
-        if not created:
-            item.quantity += int(quantity)
-        else:
-            item.quantity = int(quantity)
-        item.save()
-        return Response({'status': 'added', 'item_id': item.id}, status=201)
+        try:
+            item_ids = upsert_cart(request.user, {product_id: serializer.validated_data['quantity']})
+        except UnknownProducts:
+            return Response({'error': 'Mahsulot topilmadi'}, status=404)
+        return Response({'status': 'added', 'item_id': item_ids[product_id]}, status=201)
 
     def delete(self, request):
         product_id = request.data.get('product')
@@ -194,31 +352,75 @@ class CartView(APIView):
         except CartItem.DoesNotExist:
             return Response({'error': 'Item not found'}, status=404)
         
+# Savatchani bir so'rovda sinxronlash (mobil ilovalar uchun)
+class CartBatchView(ProfilingMixin, APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = self.profile_serializer(CartBatchSerializer(data=request.data))
+        serializer.is_valid(raise_exception=True)
+        mode = serializer.validated_data['mode']
+
+        lines = {}
+        for line in serializer.validated_data['items']:
+            if mode == CartBatchSerializer.MODE_ADD:
+                lines[line['product']] = lines.get(line['product'], 0) + line['quantity']
+            else:
+                lines[line['product']] = line['quantity']
+        removed = [product_id for product_id, quantity in lines.items() if quantity == 0]
+        lines = {product_id: quantity for product_id, quantity in lines.items() if quantity}
+
+        try:
+            with transaction.atomic():
+                if removed:
+                    CartItem.objects.filter(user=request.user, product_id__in=removed).delete()
+                item_ids = upsert_cart(request.user, lines, increment=mode == CartBatchSerializer.MODE_ADD)
+        except UnknownProducts as exc:
+            return Response({'error': 'Mahsulot topilmadi', 'products': exc.product_ids}, status=404)
+        return Response({
+            'status': 'updated',
+            'items': [{'product': product_id, 'item_id': item_id} for product_id, item_id in item_ids.items()],
+            'removed': removed,
+        }, status=200)
+
+
 # 1️⃣1️⃣ Foydalanuvchi uchun shopping
-class OrderAPIView(APIView):
+def filter_is_paid(orders, params):
+    # ?is_paid=true|false
+    is_paid = params.get('is_paid')
+    if is_paid in ('true', 'false'):
+        orders = orders.filter(is_paid=is_paid == 'true')
+    return orders
+
+
+class OrderAPIView(ProfilingMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        orders = Order.objects.filter(user=request.user)
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data)
+        context = {'request': request}
+        orders = OrderSerializer(context=context).optimize_queryset(Order.objects.filter(user=request.user))
+        orders = filter_is_paid(orders, request.query_params)
+        paginator = CreatedAtCursorPagination()
+        page = paginator.paginate_queryset(orders, request, view=self)
+        serializer = self.profile_serializer(OrderSerializer(page, many=True, context=context))
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
-        cart_items = CartItem.objects.filter(user=request.user)
-        if not cart_items.exists():
+        try:
+            order = checkout(request.user)
+        except EmptyCart:
             return Response({'error': 'Savatcha bo‘sh'}, status=400)
+        except OutOfStock as exc:
+            return Response({'error': 'Omborda yetarli mahsulot yo‘q', 'products': exc.product_ids}, status=409)
 
-        # Yangi buyurtma yaratish
-        order = Order.objects.create(user=request.user)
+        return Response({'status': 'Buyurtma yaratildi', 'order_id': order.id}, status=201)
 
-        for item in cart_items:
-            OrderItem.objects.create(
-                order=order,
-                product=item.product,
-                quantity=item.quantity
-            )
-        # Savatchani tozalash
-        cart_items.delete()
 
-        return Response({'status': 'Buyurtma yaratildi'}, status=201)
+# Buyurtmalar tarixi: elementlar o'qilmaydi, bitta so'rov
+class OrderHistoryView(ProfilingMixin, generics.ListAPIView):
+    serializer_class = OrderSummarySerializer
+    permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        orders = filter_is_paid(Order.objects.filter(user=self.request.user), self.request.query_params)
+        return self.get_serializer().optimize_queryset(orders)
@@ -0,0 +1,82 @@
+"""Istaklar ro'yxati uchun partiyaviy yozish va a'zolik keshi.
+
+Qo'shish/o'chirish ``UserProfile.wishlist.through`` jadvaliga to'g'ridan-to'g'ri
+bitta ``bulk_create`` (ON CONFLICT DO NOTHING) yoki bitta filtrlangan
+``DELETE`` bilan bajariladi. Bu yo'l ``m2m_changed`` signalini yubormaydi,
+shuning uchun kesh shu yerda qo'lda tozalanadi; ``wishlist.add()`` va
+boshqa ORM yo'llari uchun esa signal qabul qiluvchisi bor.
+
+``wishlist_ids`` foydalanuvchi istaklaridagi mahsulot id'larini keshdan
+qaytaradi — mahsulot kartochkalaridagi "yurakcha" holati uchun.
+"""
+from django.conf import settings
+
+from .cache import get_cache
+from .models import Product, UserProfile
+
+WishlistItem = UserProfile.wishlist.through
+
+
+class UnknownWishlistProducts(Exception):
+    def __init__(self, product_ids):
+        super().__init__(f"Mahsulot topilmadi: {product_ids}")
+        self.product_ids = product_ids
+
+
+def _ids_key(user_id):
+    return f'shop:wishlist-ids:{user_id}'
+
+
+def wishlist_ids(user_id):
+    cache = get_cache()
+    ids = cache.get(_ids_key(user_id))
+    if ids is None:
+        ids = frozenset(
+            WishlistItem.objects.filter(userprofile__user_id=user_id).values_list('product_id', flat=True)
+        )
+        cache.set(_ids_key(user_id), ids, getattr(settings, 'SHOP_WISHLIST_CACHE_TIMEOUT', 600))
+    return ids
+
+
+def forget_wishlist(*user_ids):
+    get_cache().delete_many([_ids_key(user_id) for user_id in user_ids])
+
+
+def _profile_id(user):
+    return UserProfile.objects.filter(user=user).values_list('pk', flat=True).get()
+
+
+def add_to_wishlist(user, product_ids):
+    """Yangi qo'shilgan yozuvlar sonini emas, so'ralgan id'larni qaytaradi."""
+    product_ids = sorted(set(product_ids))
+    found = set(Product.objects.filter(pk__in=product_ids).values_list('pk', flat=True))
+    missing = [pk for pk in product_ids if pk not in found]
+    if missing:
+        raise UnknownWishlistProducts(missing)
+
+    profile_id = _profile_id(user)
+    WishlistItem.objects.bulk_create(
+        [WishlistItem(userprofile_id=profile_id, product_id=pk) for pk in product_ids],
+        ignore_conflicts=True,
+    )
+    forget_wishlist(user.pk)
+    return product_ids
+
+
+def remove_from_wishlist(user, product_ids):
+    """O'chirilgan yozuvlar sonini qaytaradi; ro'yxatda yo'q id'lar e'tiborsiz qoldiriladi."""
+    deleted, _ = WishlistItem.objects.filter(
+        userprofile__user=user, product_id__in=set(product_ids)
+    ).delete()
+    forget_wishlist(user.pk)
+    return deleted
+
+
+def membership(user_id, product_ids):
+    """So'ralgan tartibda: istaklardagi id'lar va '0'/'1' bitset satri."""
+    ids = wishlist_ids(user_id)
+    flags = [pk in ids for pk in product_ids]
+    return {
+        'ids': [pk for pk, flag in zip(product_ids, flags) if flag],
+        'bitset': ''.join('1' if flag else '0' for flag in flags),
+    }